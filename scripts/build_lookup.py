@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Build the Google Maps lookup used by merge_google_data.py.
+
+The merge looks up scraped results by the original restaurant name and
+address. Parsing google_maps_raw.json and rebuilding that dict on every run
+is the slowest part of the script, so the lookup is pickled next to the raw
+data and reused until the raw file changes. create_test_dataset.py shares the
+key format and loader but walks the raw results, repeats included.
+
+Usage:
+    python build_lookup.py
+"""
+
+import mmap
+import pickle
+from pathlib import Path
+
+import orjson
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR.parent / "data"
+GOOGLE_FILE = DATA_DIR / "google_maps_raw.json"
+LOOKUP_FILE = DATA_DIR / "google_lookup.pkl"
+
+# Bump when the key format changes so stale pickles get rebuilt
+LOOKUP_FORMAT = 2
+
+
+def create_lookup_key(name, address):
+    """
+    Create a lookup key from name and address.
+
+    A tuple hashes without building a joined string, and a '|' inside a
+    name can't make two different restaurants collide.
+    """
+    return (name, address)
+
+
+def load_google_results(google_file=GOOGLE_FILE):
+    """
+    Parse the results list from the scraped Google Maps file.
+
+    The file is memory-mapped and parsed in place, so peak memory holds only
+    the parsed results rather than an extra in-memory copy of the raw JSON.
+    """
+    with open(google_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return orjson.loads(view).get('results', [])
+
+
+def build_google_lookup(google_results):
+    """
+    Index scraped Google results by their original name and address.
+
+    Args:
+        google_results: List of result dicts from google_maps_raw.json
+
+    Returns:
+        Dict of lookup key -> result (later duplicates win)
+    """
+    return {
+        create_lookup_key(result.get('original_name', ''), result.get('original_address', '')): result
+        for result in google_results
+    }
+
+
+def save_google_lookup(lookup, lookup_file=LOOKUP_FILE):
+    """Pickle a lookup built by build_google_lookup()."""
+    with open(lookup_file, 'wb') as f:
+        pickle.dump({'format': LOOKUP_FORMAT, 'lookup': lookup}, f, protocol=5)
+
+
+def load_google_lookup(google_file=GOOGLE_FILE, lookup_file=LOOKUP_FILE):
+    """
+    Load the Google lookup, rebuilding it if the raw data is newer.
+
+    Args:
+        google_file: Scraped Google Maps JSON file
+        lookup_file: Pickled lookup cache
+
+    Returns:
+        Dict of lookup key -> Google result
+    """
+    google_file = Path(google_file)
+    lookup_file = Path(lookup_file)
+
+    if lookup_file.exists() and lookup_file.stat().st_mtime >= google_file.stat().st_mtime:
+        with open(lookup_file, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get('format') == LOOKUP_FORMAT:
+            return cached['lookup']
+
+    lookup = build_google_lookup(load_google_results(google_file))
+    save_google_lookup(lookup, lookup_file)
+    return lookup
+
+
+def main():
+    if not GOOGLE_FILE.exists():
+        print(f"Error: Google Maps data file not found: {GOOGLE_FILE}")
+        print("Run scrape_google_maps.py first to generate this file.")
+        return
+
+    lookup = build_google_lookup(load_google_results())
+    save_google_lookup(lookup)
+    print(f"Saved {len(lookup)} lookup entries to: {LOOKUP_FILE}")
+
+
+if __name__ == '__main__':
+    main()
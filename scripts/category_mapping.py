@@ -5,6 +5,21 @@ Category Mapping for Google Maps → Ethnicity Categories
 Maps Google Maps restaurant categories to our existing ethnicity/country system.
 """
 
+import re
+import sys
+from collections import Counter, defaultdict
+from functools import lru_cache
+from types import MappingProxyType
+
+
+def _intern_mapping(mapping):
+    """Return a copy of a str -> str/None mapping with all strings interned."""
+    return {
+        sys.intern(key): sys.intern(value) if value else value
+        for key, value in mapping.items()
+    }
+
+
 # Google Maps category → Our ethnicity category
 # Based on common Google Maps restaurant type labels
 GOOGLE_TO_ETHNICITY = {
@@ -289,11 +304,118 @@ GOOGLE_TO_ETHNICITY = {
     "catering service": None,
 }
 
+# The table is exposed read-only since lookups below are cached and
+# precomputed from it; module internals use the underlying dict directly.
+_GOOGLE_TO_ETHNICITY = _intern_mapping(GOOGLE_TO_ETHNICITY)
+GOOGLE_TO_ETHNICITY = MappingProxyType(_GOOGLE_TO_ETHNICITY)
+
+
+def _is_word_char(ch):
+    """Return True for word characters (letters, digits, underscore)."""
+    return ch.isalnum() or ch == '_'
+
+
+def _ends_word(text, end):
+    """
+    Return True if a key ending at text[end] ends a word there.
+
+    A plural "s" or "es" may follow first, so "bars" and "delis" still
+    contain "bar" and "deli" while "barber" does not contain "bar".
+    """
+    for suffix in ('', 's', 'es'):
+        if text.startswith(suffix, end):
+            stop = end + len(suffix)
+            if stop == len(text) or not _is_word_char(text[stop]):
+                return True
+    return False
+
+
+# "<adjective> <cuisine> restaurant" - used to pull out the cuisine word
+_CUISINE_RE = re.compile(r'(\w+)\s+restaurant')
+
+
+def _build_suffix_index(mapping):
+    """
+    Bucket mapped keys by their last word for trailing-phrase lookups.
+
+    Returns:
+        tuple: ({last_word: {key: category}}, set of every word used in a key)
+    """
+    by_suffix = defaultdict(dict)
+    key_words = set()
+    for key, category in mapping.items():
+        if not category:
+            continue
+        words = key.split()
+        by_suffix[words[-1]][key] = category
+        key_words.update(words)
+    return dict(by_suffix), frozenset(key_words)
+
+
+_BY_SUFFIX, _KEY_WORDS = _build_suffix_index(GOOGLE_TO_ETHNICITY)
+_MAPPED_KEYS = tuple(k for k, v in GOOGLE_TO_ETHNICITY.items() if v)
+
+# Longest first for the partial-match scan; the sort is stable, so keys of
+# equal length keep their GOOGLE_TO_ETHNICITY order. Generic keys that map to
+# None are left out so they can't shadow a more specific category.
+_KEYS_LONGEST_FIRST = tuple(sorted(_MAPPED_KEYS, key=len, reverse=True))
+
+
+def _match_trailing_phrase(normalized):
+    """
+    Look up the longest known category that ends the string on a word boundary.
+
+    Only trusted when none of the leading words belong to a known category;
+    otherwise a longer match may start earlier and the caller should fall
+    back to the full scan.
+
+    Returns:
+        The mapped category, or None
+    """
+    tokens = normalized.split()
+    if not tokens:
+        return None
+    bucket = _BY_SUFFIX.get(tokens[-1])
+    if bucket is None:
+        return None
+    for i in range(len(tokens)):
+        category = bucket.get(" ".join(tokens[i:]))
+        if category is not None:
+            return category if _KEY_WORDS.isdisjoint(tokens[:i]) else None
+    return None
+
+
+def _find_longest_key(text):
+    """
+    Find the longest mapped GOOGLE_TO_ETHNICITY key contained in text.
+
+    Keys only count as whole words, so "bar" is not found in "barber shop",
+    though a plural ending is allowed ("bars"). Ties between equal-length
+    keys go to the one defined first in GOOGLE_TO_ETHNICITY.
+
+    Returns:
+        The matching key, or None if no key occurs in text
+    """
+    for key in _KEYS_LONGEST_FIRST:
+        if key not in text:
+            continue
+        start = text.find(key)
+        while start != -1:
+            if ((start == 0 or not _is_word_char(text[start - 1]))
+                    and _ends_word(text, start + len(key))):
+                return key
+            start = text.find(key, start + 1)
+    return None
 
+
+@lru_cache(maxsize=4096)
 def map_google_category(google_category):
     """
     Map a Google Maps category to our ethnicity system.
 
+    Results are cached - scraped data only contains a few hundred distinct
+    Google labels, so repeat lookups skip the fallback matching entirely.
+
     Args:
         google_category: The category string from Google Maps (e.g., "Mexican restaurant")
 
@@ -303,32 +425,54 @@ def map_google_category(google_category):
     if not google_category:
         return None
 
-    # Normalize the category
-    normalized = google_category.lower().strip()
+    get = _GOOGLE_TO_ETHNICITY.get
+
+    # Normalize the category. Google only uses a few hundred labels, so
+    # interning them keeps later dict hits to a pointer comparison.
+    normalized = sys.intern(google_category.lower().strip())
 
     # Direct lookup
-    if normalized in GOOGLE_TO_ETHNICITY:
-        return GOOGLE_TO_ETHNICITY[normalized]
+    if normalized in _GOOGLE_TO_ETHNICITY:
+        return get(normalized)
+
+    # Try partial matches (for categories like "Fine Mexican restaurant"),
+    # first on the trailing phrase, then anywhere in the string preferring
+    # the longest known category
+    category = _match_trailing_phrase(normalized)
+    if category is not None:
+        return category
 
-    # Try partial matches (for categories like "Fine Mexican restaurant")
-    for google_cat, ethnicity in GOOGLE_TO_ETHNICITY.items():
-        if google_cat in normalized:
-            return ethnicity
+    google_cat = _find_longest_key(normalized)
+    if google_cat is not None:
+        return get(google_cat)
 
     # Try extracting the cuisine type
-    # Pattern: "<adjective> <cuisine> restaurant"
-    import re
-    match = re.search(r'(\w+)\s+restaurant', normalized)
+    match = _CUISINE_RE.search(normalized)
     if match:
-        cuisine_word = match.group(1)
         # Check if this word maps to a known cuisine
-        test_key = f"{cuisine_word} restaurant"
-        if test_key in GOOGLE_TO_ETHNICITY:
-            return GOOGLE_TO_ETHNICITY[test_key]
+        return get(f"{match.group(1)} restaurant")
 
     return None
 
 
+def map_google_category_batch(google_categories):
+    """
+    Map many Google Maps categories at once.
+
+    Each distinct label is mapped a single time, so bulk mapping stays cheap
+    even when there are more labels than map_google_category's cache holds.
+
+    Args:
+        google_categories: Iterable of category strings from Google Maps
+
+    Returns:
+        List of mapped categories (or None), aligned with the input
+    """
+    labels = list(google_categories)
+    mapped = {label: map_google_category(label) for label in set(labels)}
+    return [mapped[label] for label in labels]
+
+
 def get_improvement_stats(scraped_results):
     """
     Calculate statistics on how much the Google data improves our categorization.
@@ -339,48 +483,50 @@ def get_improvement_stats(scraped_results):
     Returns:
         Dictionary with improvement statistics
     """
-    stats = {
-        'total': len(scraped_results),
-        'found': 0,
-        'confident_matches': 0,
-        'improved': 0,
-        'already_specific': 0,
-        'no_improvement': 0,
-        'category_distribution': {}
-    }
+    found_results = [result for result in scraped_results if result.get('found')]
+    mapped_categories = map_google_category_batch(
+        result.get('google_category', '') for result in found_results
+    )
 
-    for result in scraped_results:
-        if not result.get('found'):
-            continue
+    unspecified = _UNSPECIFIED
+    distribution = Counter()
+    confident_matches = improved = already_specific = no_improvement = 0
 
-        stats['found'] += 1
+    for result, mapped in zip(found_results, mapped_categories):
+        get = result.get
 
-        if result.get('confident_match'):
-            stats['confident_matches'] += 1
+        if get('confident_match'):
+            confident_matches += 1
 
-        original = result.get('original_category', '')
-        google_cat = result.get('google_category', '')
-        mapped = map_google_category(google_cat)
+        original = get('original_category', '')
 
         # Track category distribution
         if mapped:
-            stats['category_distribution'][mapped] = stats['category_distribution'].get(mapped, 0) + 1
+            distribution[mapped] += 1
 
         # Check if this improves the categorization
-        if 'Unspecified' in original:
-            if mapped and 'Unspecified' not in mapped:
-                stats['improved'] += 1
+        if original in unspecified:
+            if mapped and mapped not in unspecified:
+                improved += 1
             else:
-                stats['no_improvement'] += 1
+                no_improvement += 1
         else:
-            stats['already_specific'] += 1
+            already_specific += 1
 
-    return stats
+    return {
+        'total': len(scraped_results),
+        'found': len(found_results),
+        'confident_matches': confident_matches,
+        'improved': improved,
+        'already_specific': already_specific,
+        'no_improvement': no_improvement,
+        'category_distribution': dict(distribution)
+    }
 
 
 # Location-based categories (countries, ethnicities, cities, regions)
 # These are PREFERRED over food-type categories
-LOCATION_BASED_CATEGORIES = {
+LOCATION_BASED_CATEGORIES = frozenset(map(sys.intern, {
     # East Asian - Countries
     "Chinese", "Japanese", "Korean", "Vietnamese", "Thai",
     "Filipino", "Indonesian", "Malaysian", "Singaporean",
@@ -441,11 +587,11 @@ LOCATION_BASED_CATEGORIES = {
     "West African", "East African", "North African",
     "Mediterranean (Unspecified)", "Asian (Unspecified)",
     "Asian Fusion", "Pan-Asian",
-}
+}))
 
 # Food-type categories (dishes, venues, diet styles)
 # These are LOWER priority than location-based categories
-FOOD_TYPE_CATEGORIES = {
+FOOD_TYPE_CATEGORIES = frozenset(map(sys.intern, {
     # Dish-specific
     "Sushi", "Ramen", "Pizza", "Noodles", "BBQ", "Burgers",
     "Seafood", "Steakhouse", "Korean BBQ", "Brazilian Steakhouse",
@@ -472,7 +618,7 @@ FOOD_TYPE_CATEGORIES = {
 
     # Other
     "Food Truck", "Street Food", "Spanish Tapas",
-}
+}))
 
 # Mapping from specific categories to their immediate parent category
 # This supports multi-level hierarchies (e.g., Cantonese -> Chinese -> Asian)
@@ -810,6 +956,75 @@ SPECIFIC_TO_GENERAL = {
     "Bagels": "Bakery",
 }
 
+# Read-only for the same reason as GOOGLE_TO_ETHNICITY
+_SPECIFIC_TO_GENERAL = _intern_mapping(SPECIFIC_TO_GENERAL)
+SPECIFIC_TO_GENERAL = MappingProxyType(_SPECIFIC_TO_GENERAL)
+
+_SPECIFIC_TO_GENERAL_GET = _SPECIFIC_TO_GENERAL.get
+
+# Parallel key/parent arrays plus a key -> index lookup, used by the
+# import-time hierarchy walks below
+_KEYS = tuple(_SPECIFIC_TO_GENERAL)
+_VALS = tuple(_SPECIFIC_TO_GENERAL.values())
+_IDX = {key: i for i, key in enumerate(_KEYS)}
+
+# Every known "<Region> (Unspecified)" category, so hot loops can test
+# membership instead of scanning strings. "Unspecified" only ever appears
+# as that trailing qualifier, and every such name appears in one of these
+# tables.
+_UNSPECIFIED = frozenset(
+    category
+    for category in (
+        *SPECIFIC_TO_GENERAL,
+        *SPECIFIC_TO_GENERAL.values(),
+        *GOOGLE_TO_ETHNICITY.values(),
+        *LOCATION_BASED_CATEGORIES,
+        *FOOD_TYPE_CATEGORIES,
+    )
+    if category and 'Unspecified' in category
+)
+
+
+def _validate_hierarchy():
+    """
+    Make sure SPECIFIC_TO_GENERAL contains no cycles.
+
+    Raises:
+        ValueError: If following parents from any category loops back on itself
+    """
+    for start in range(len(_KEYS)):
+        visited = set()
+        i = start
+        while i is not None:
+            if i in visited:
+                raise ValueError(f"Cycle in SPECIFIC_TO_GENERAL starting at {_KEYS[start]!r}")
+            visited.add(i)
+            i = _IDX.get(_VALS[i])
+
+
+def _walk_hierarchy(category):
+    """
+    Walk SPECIFIC_TO_GENERAL from a category up to its top-level parent.
+
+    Assumes the hierarchy has been checked by _validate_hierarchy().
+
+    Returns:
+        List from specific to general (e.g., ["Cantonese", "Chinese", "Asian"])
+    """
+    chain = [category]
+    i = _IDX.get(category)
+    while i is not None:
+        parent = _VALS[i]
+        chain.append(parent)
+        i = _IDX.get(parent)
+    return chain
+
+
+# The hierarchy is static, so check it and resolve every chain once at import
+_validate_hierarchy()
+_CHAINS = {cat: tuple(_walk_hierarchy(cat)) for cat in _KEYS}
+_TOP_LEVEL = {cat: chain[-1] for cat, chain in _CHAINS.items()}
+
 
 def is_location_based(category):
     """
@@ -839,7 +1054,7 @@ def get_general_category(specific_cat):
     """
     if not specific_cat:
         return None
-    return SPECIFIC_TO_GENERAL.get(specific_cat, specific_cat)
+    return _SPECIFIC_TO_GENERAL_GET(specific_cat, specific_cat)
 
 
 def get_top_level_category(category):
@@ -855,15 +1070,7 @@ def get_top_level_category(category):
     """
     if not category:
         return None
-
-    current = category
-    visited = set()  # Prevent infinite loops
-
-    while current in SPECIFIC_TO_GENERAL and current not in visited:
-        visited.add(current)
-        current = SPECIFIC_TO_GENERAL[current]
-
-    return current
+    return _TOP_LEVEL.get(category, category)
 
 
 def get_category_chain(category):
@@ -878,18 +1085,8 @@ def get_category_chain(category):
     """
     if not category:
         return []
-
-    chain = [category]
-    visited = set()
-
-    current = category
-    while current in SPECIFIC_TO_GENERAL and current not in visited:
-        visited.add(current)
-        parent = SPECIFIC_TO_GENERAL[current]
-        chain.append(parent)
-        current = parent
-
-    return chain
+    # A fresh list each call; the precomputed chains are shared tuples
+    return list(_CHAINS.get(category, (category,)))
 
 
 def determine_final_categories(original_cat, google_cat_mapped):
@@ -909,30 +1106,47 @@ def determine_final_categories(original_cat, google_cat_mapped):
     Returns:
         tuple: (final_cat_specific, final_cat_general)
     """
-    # Determine the specific category
-    if google_cat_mapped and is_location_based(google_cat_mapped):
+    # Determine the specific category (same rules as is_location_based, inlined)
+    location_based = LOCATION_BASED_CATEGORIES
+    if google_cat_mapped and google_cat_mapped in location_based:
         final_specific = google_cat_mapped
-    elif original_cat and is_location_based(original_cat):
+    elif original_cat and original_cat in location_based:
         final_specific = original_cat
-    elif google_cat_mapped:
-        final_specific = google_cat_mapped
     else:
-        final_specific = original_cat
+        final_specific = google_cat_mapped or original_cat
 
     # Determine the general category from the specific one
-    final_general = get_general_category(final_specific)
-
-    return final_specific, final_general
+    if not final_specific:
+        return final_specific, None
+    return final_specific, _SPECIFIC_TO_GENERAL_GET(final_specific, final_specific)
 
 
 # Keep old function name for backwards compatibility
 def determine_final_category(original_cat, google_cat_mapped):
     """Backwards compatible wrapper - returns only specific category."""
-    specific, _ = determine_final_categories(original_cat, google_cat_mapped)
-    return specific
+    return determine_final_categories(original_cat, google_cat_mapped)[0]
 
 
-if __name__ == '__main__':
+def classify(google_category, original_category):
+    """
+    Map a raw Google label and pick the final categories in one call.
+
+    Shorthand for map_google_category() followed by
+    determine_final_categories(), for callers that don't need the
+    intermediate mapped category.
+
+    Args:
+        google_category: Raw category label from Google Maps
+        original_category: Original category from DOHMH data
+
+    Returns:
+        tuple: (final_cat_specific, final_cat_general)
+    """
+    return determine_final_categories(original_category, map_google_category(google_category))
+
+
+def _selftest():
+    """Print sample mappings and final-category decisions."""
     # Test the mapping
     test_categories = [
         "Mexican restaurant",
@@ -952,6 +1166,21 @@ if __name__ == '__main__':
         mapped = map_google_category(cat)
         print(f"  {cat:40} -> {mapped}")
 
+    # Partial matches: whole words only, but plural labels still count
+    expected = {
+        "latin american restaurants": "Latin American (Unspecified)",
+        "korean bbq restaurants": "Korean BBQ",
+        "south african restaurants": "South African",
+        "bars": "Bar",
+        "delis": "Deli",
+        "barber shop": None,
+        "pizza delivery": None,
+    }
+    for cat, want in expected.items():
+        mapped = map_google_category(cat)
+        assert mapped == want, f"{cat!r} -> {mapped!r}, expected {want!r}"
+        print(f"  {cat:40} -> {mapped}")
+
     print("\n" + "=" * 70)
     print("Dual Category Tests (Specific + General):")
     print("=" * 70)
@@ -978,3 +1207,7 @@ if __name__ == '__main__':
     for original, google in test_final:
         specific, general = determine_final_categories(original, google)
         print(f"  {str(original):<25} {str(google):<15} {str(specific):<20} {str(general):<20}")
+
+
+if __name__ == '__main__':
+    _selftest()
@@ -3,19 +3,27 @@
 Create a test dataset with just the scraped restaurants for visualization.
 """
 
-import json
+import hashlib
 from pathlib import Path
+
+import orjson
+
+from build_lookup import create_lookup_key, load_google_results
 from category_mapping import map_google_category
 
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR.parent / "data"
 
-# Load data
-with open(DATA_DIR / "restaurants.json", 'r', encoding='utf-8') as f:
-    original_data = json.load(f)
 
-with open(DATA_DIR / "google_maps_raw.json", 'r', encoding='utf-8') as f:
-    google_data = json.load(f)
+def truncate(text, width):
+    """Shorten text to fit a table column of the given width."""
+    return text[:width - 2] + '..' if len(text) > width else text
+
+
+# Load data
+original_data = orjson.loads((DATA_DIR / "restaurants.json").read_bytes())
+# Every scraped result, repeats included (the lookup dict keeps only the last)
+google_results = load_google_results(DATA_DIR / "google_maps_raw.json")
 
 # Get the colors from original data
 colors = original_data.get('colors', {})
@@ -23,15 +31,15 @@ colors = original_data.get('colors', {})
 # Create lookup for original restaurants
 original_lookup = {}
 for r in original_data['restaurants']:
-    key = f"{r['name']}|{r['address']}"
+    key = create_lookup_key(r['name'], r['address'])
     original_lookup[key] = r
 
 # Build test dataset with enriched categories
 test_restaurants = []
 attribute_table = []
 
-for result in google_data['results']:
-    key = f"{result['original_name']}|{result['original_address']}"
+for result in google_results:
+    key = create_lookup_key(result['original_name'], result['original_address'])
 
     if key not in original_lookup:
         continue
@@ -51,6 +59,11 @@ for result in google_data['results']:
         final_category = result['original_category']
         category_source = 'DOHMH'
 
+    # Generate a color for new categories from the first three hash bytes
+    if final_category not in colors:
+        digest = hashlib.md5(final_category.encode()).digest()
+        colors[final_category] = [digest[0], digest[1], digest[2]]
+
     # Build restaurant record
     restaurant = {
         'name': orig['name'],
@@ -81,19 +94,6 @@ for result in google_data['results']:
     }
     attribute_table.append(attr_row)
 
-# Add any new categories to colors
-for r in test_restaurants:
-    cat = r['category']
-    if cat not in colors:
-        # Generate a color for new categories
-        import hashlib
-        hash_val = int(hashlib.md5(cat.encode()).hexdigest()[:6], 16)
-        colors[cat] = [
-            (hash_val >> 16) & 0xFF,
-            (hash_val >> 8) & 0xFF,
-            hash_val & 0xFF
-        ]
-
 # Save test dataset
 test_data = {
     'restaurants': test_restaurants,
@@ -102,8 +102,9 @@ test_data = {
     'description': 'Test dataset with 100 scraped restaurants'
 }
 
-with open(DATA_DIR / "restaurants_test.json", 'w', encoding='utf-8') as f:
-    json.dump(test_data, f, indent=2)
+(DATA_DIR / "restaurants_test.json").write_bytes(
+    orjson.dumps(test_data, option=orjson.OPT_INDENT_2)
+)
 
 # Print attribute table
 print("=" * 120)
@@ -112,12 +113,14 @@ print("=" * 120)
 print(f"{'Name':<35} {'Original Category':<28} {'Google Category':<25} {'Final':<20} {'Improved'}")
 print("-" * 120)
 
-for row in attribute_table:
-    name = row['name'][:33] + '..' if len(row['name']) > 35 else row['name']
-    orig = row['original_category'][:26] + '..' if len(row['original_category']) > 28 else row['original_category']
-    google = row['google_category'][:23] + '..' if len(row['google_category']) > 25 else row['google_category']
-    final = row['final_category'][:18] + '..' if len(row['final_category']) > 20 else row['final_category']
-    print(f"{name:<35} {orig:<28} {google:<25} {final:<20} {row['improved']}")
+# Format every row first and write the table out in one call
+table_lines = [
+    f"{truncate(row['name'], 35):<35} {truncate(row['original_category'], 28):<28} "
+    f"{truncate(row['google_category'], 25):<25} {truncate(row['final_category'], 20):<20} {row['improved']}"
+    for row in attribute_table
+]
+if table_lines:
+    print('\n'.join(table_lines))
 
 print("-" * 120)
 
@@ -11,61 +11,143 @@ Usage:
     python merge_google_data.py --dry-run  # Preview changes without saving
 """
 
-import json
+import re
+import heapq
 import argparse
 from pathlib import Path
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from difflib import SequenceMatcher
+from functools import lru_cache
+
+import orjson
+
+from build_lookup import create_lookup_key, load_google_lookup
 from category_mapping import map_google_category, get_improvement_stats, determine_final_categories
 
 
-def similarity(a, b):
-    """Calculate string similarity ratio (case-insensitive)."""
+@lru_cache(maxsize=1024)
+def _matcher_for(b):
+    """
+    Get a SequenceMatcher with b already indexed.
+
+    SequenceMatcher does its expensive preprocessing on the second sequence,
+    so comparing many strings against the same b reuses that work.
+    """
+    return SequenceMatcher(None, '', b, autojunk=True)
+
+
+def similarity(a, b, score_cutoff=0):
+    """
+    Calculate string similarity ratio (case-insensitive).
+
+    Args:
+        a, b: Strings to compare
+        score_cutoff: Scores below this are reported as 0. The cheap upper
+            bounds are checked first, so pairs that can't reach the cutoff
+            skip the full comparison.
+    """
     if not a or not b:
         return 0
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+    a, b = a.lower(), b.lower()
+    if a == b:
+        return 1.0
+    matcher = _matcher_for(b)
+    matcher.set_seq1(a)
+    if score_cutoff and (matcher.real_quick_ratio() < score_cutoff
+                         or matcher.quick_ratio() < score_cutoff):
+        return 0
+    ratio = matcher.ratio()
+    return ratio if ratio >= score_cutoff else 0
+
+
+# Common street-type words and their abbreviations
+ADDRESS_ABBREVIATIONS = {
+    'street': 'st',
+    'avenue': 'ave',
+    'boulevard': 'blvd',
+    'road': 'rd',
+    'drive': 'dr',
+    'place': 'pl',
+    'court': 'ct',
+    'lane': 'ln',
+}
+_ABBREVIATION_RE = re.compile(r'\b(' + '|'.join(ADDRESS_ABBREVIATIONS) + r')\b')
 
 
+def _abbreviate(match, abbreviations=ADDRESS_ABBREVIATIONS):
+    """Substitution callback for _ABBREVIATION_RE."""
+    return abbreviations[match.group(1)]
+
+
+@lru_cache(maxsize=None)
 def normalize_address(addr):
     """
     Normalize address for comparison.
     - Lowercase
     - Remove city/state/zip (everything after first comma)
     - Normalize common abbreviations
+
+    Results are cached since the same addresses come up repeatedly.
     """
     if not addr:
         return ''
 
-    # Lowercase
-    addr = addr.lower()
-
-    # Remove city/state/zip (after first comma)
-    if ',' in addr:
-        addr = addr.split(',')[0]
-
-    # Normalize common abbreviations
-    replacements = [
-        ('street', 'st'),
-        ('avenue', 'ave'),
-        ('boulevard', 'blvd'),
-        ('road', 'rd'),
-        ('drive', 'dr'),
-        ('place', 'pl'),
-        ('court', 'ct'),
-        ('lane', 'ln'),
-        ('  ', ' '),  # double spaces
-    ]
-    for old, new in replacements:
-        addr = addr.replace(old, new)
+    # Lowercase and remove city/state/zip (after first comma)
+    addr = addr.lower().partition(',')[0]
 
-    return addr.strip()
+    # Normalize common abbreviations in one pass, then collapse whitespace
+    addr = _ABBREVIATION_RE.sub(_abbreviate, addr)
+    return ' '.join(addr.split())
 
 
-def address_similarity(addr1, addr2):
+def address_similarity(addr1, addr2, score_cutoff=0):
     """Calculate similarity between two addresses after normalization."""
     norm1 = normalize_address(addr1)
     norm2 = normalize_address(addr2)
-    return similarity(norm1, norm2)
+    if norm1 == norm2:
+        return 1.0 if norm1 else 0
+    return similarity(norm1, norm2, score_cutoff)
+
+
+def score_address(original_addr, google_addr, name_sim):
+    """
+    Address similarity for one candidate match.
+
+    The name similarity decides how close the address has to be, so scores
+    below that bar are cut off early; at a name similarity of 0.5 or lower no
+    address is good enough and the comparison is skipped (returns 0).
+    """
+    if google_addr and original_addr and name_sim > 0.5:
+        return address_similarity(original_addr, google_addr, 0.7 if name_sim > 0.8 else 0.9)
+    return 0
+
+
+def _score_address_chunk(candidates):
+    """Worker entry point: score a list of (original, google, name_sim) tuples."""
+    return [score_address(*candidate) for candidate in candidates]
+
+
+def score_addresses(candidates, workers=1):
+    """
+    Score address similarity for many candidates, optionally in parallel.
+
+    Args:
+        candidates: List of (original_addr, google_addr, name_sim) tuples
+        workers: Number of processes to spread the work over (1 = serial)
+
+    Returns:
+        List of address similarities, aligned with candidates
+    """
+    if workers <= 1 or len(candidates) < 2 * workers:
+        return _score_address_chunk(candidates)
+
+    chunk_size = -(-len(candidates) // workers)
+    chunks = [candidates[i:i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [score for chunk in executor.map(_score_address_chunk, chunks) for score in chunk]
+
 
 # Paths
 SCRIPT_DIR = Path(__file__).parent
@@ -75,129 +157,136 @@ GOOGLE_FILE = DATA_DIR / "google_maps_raw.json"
 OUTPUT_FILE = DATA_DIR / "restaurants_enriched.json"
 
 
+@dataclass(slots=True)
+class MatchRecord:
+    """A confidently matched restaurant, as reported by print_stats()."""
+    name: str
+    address: str
+    original_category: str
+    google_category: str
+    mapped_category: str
+    final_cat_specific: str
+    final_cat_general: str
+    name_similarity: float
+    address_similarity: float
+
+
 def load_json(filepath):
     """Load a JSON file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return orjson.loads(Path(filepath).read_bytes())
 
 
 def save_json(data, filepath):
     """Save data to a JSON file."""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    Path(filepath).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
 
-def create_lookup_key(name, address):
-    """Create a lookup key from name and address."""
-    return f"{name}|{address}"
-
-
-def merge_data(original_data, google_data, dry_run=False, limit=None):
+def merge_data(original_data, google_lookup, dry_run=False, limit=None, workers=1):
     """
     Merge Google Maps data with original restaurant data.
 
     Args:
         original_data: Original preprocessed restaurant data
-        google_data: Scraped Google Maps data
+        google_lookup: Scraped Google Maps results keyed by create_lookup_key()
+            (see build_lookup.py)
         dry_run: If True, don't save, just report what would change
         limit: If set, only process first N restaurants
+        workers: Processes to use for address scoring (1 = serial)
 
     Returns:
         Merged data and statistics
     """
     restaurants = original_data.get('restaurants', [])
-    google_results = google_data.get('results', [])
 
     # Apply limit if specified
     if limit:
         restaurants = restaurants[:limit]
 
-    # Create lookup from Google data
-    google_lookup = {}
-    for result in google_results:
-        key = create_lookup_key(
-            result.get('original_name', ''),
-            result.get('original_address', '')
-        )
-        google_lookup[key] = result
+    # Join restaurants to their Google results up front, so the per-match
+    # work below only runs over restaurants that were actually scraped
+    get_google = google_lookup.get
+    matched = []
+    for restaurant in restaurants:
+        google_result = get_google(create_lookup_key(
+            restaurant.get('name', ''),
+            restaurant.get('address', '')
+        ))
+        if google_result is not None:
+            matched.append((restaurant, google_result))
 
     # Track changes
     stats = {
         'total_restaurants': len(restaurants),
-        'google_matches': 0,
+        'google_matches': len(matched),
         'confident_matches': 0,
         'low_confidence_skipped': 0,
         'no_google_category': 0,
         'matches': []
     }
 
+    # Pull out the fields used below once per match
+    fields = [
+        (restaurant.get('address', ''), google_result.get('google_address', ''),
+         google_result.get('name_similarity', 0), google_result.get('google_category', ''),
+         google_result.get('google_name'))
+        for restaurant, google_result in matched
+    ]
+
+    # Address scoring is the expensive, side-effect free part of the merge,
+    # so it runs as a separate pass that can be spread across processes
+    addr_sims = score_addresses([f[:3] for f in fields], workers)
+
     # Merge
-    for restaurant in restaurants:
-        key = create_lookup_key(
-            restaurant.get('name', ''),
-            restaurant.get('address', '')
-        )
-
-        if key in google_lookup:
-            google_result = google_lookup[key]
-            stats['google_matches'] += 1
-
-            # Calculate name similarity
-            name_sim = google_result.get('name_similarity', 0)
-
-            # Calculate address similarity (normalized)
-            addr_sim = 0
-            google_addr = google_result.get('google_address', '')
-            original_addr = restaurant.get('address', '')
-            if google_addr and original_addr:
-                addr_sim = address_similarity(original_addr, google_addr)
-
-            # Matching: (name_sim > 0.8 AND addr_sim > 0.7) OR (name_sim > 0.5 AND addr_sim > 0.9)
-            is_confident = (name_sim > 0.8 and addr_sim > 0.7) or (name_sim > 0.5 and addr_sim > 0.9)
-
-            if not is_confident:
-                stats['low_confidence_skipped'] += 1
-                continue
-
-            stats['confident_matches'] += 1
-
-            # Get Google category
-            google_cat = google_result.get('google_category', '')
-            if not google_cat:
-                stats['no_google_category'] += 1
-                continue
-
-            # Map Google category to our system
-            mapped_category = map_google_category(google_cat)
-
-            original_cat = restaurant.get('category', '')
-
-            # Determine final categories (specific and general)
-            final_specific, final_general = determine_final_categories(original_cat, mapped_category)
-
-            # Track the match
-            stats['matches'].append({
-                'name': restaurant.get('name'),
-                'address': restaurant.get('address'),
-                'original_category': original_cat,
-                'google_category': google_cat,
-                'mapped_category': mapped_category,
-                'final_cat_specific': final_specific,
-                'final_cat_general': final_general,
-                'name_similarity': round(name_sim, 2),
-                'address_similarity': round(addr_sim, 2)
-            })
-
-            # Add Google data to restaurant (keep both original and Google)
-            if not dry_run:
-                restaurant['google_name'] = google_result.get('google_name')
-                restaurant['google_address'] = google_addr
-                restaurant['google_category'] = google_cat
-                restaurant['google_category_mapped'] = mapped_category
-                restaurant['final_cat_specific'] = final_specific
-                restaurant['final_cat_general'] = final_general
-                restaurant['name_similarity'] = round(name_sim, 2)
-                restaurant['address_similarity'] = round(addr_sim, 2)
+    for (restaurant, _), row, addr_sim in zip(matched, fields, addr_sims):
+        original_addr, google_addr, name_sim, google_cat, google_name = row
+
+        # Matching: (name_sim > 0.8 AND addr_sim > 0.7) OR (name_sim > 0.5 AND addr_sim > 0.9)
+        is_confident = (name_sim > 0.8 and addr_sim > 0.7) or (name_sim > 0.5 and addr_sim > 0.9)
+
+        if not is_confident:
+            stats['low_confidence_skipped'] += 1
+            continue
+
+        stats['confident_matches'] += 1
+
+        if not google_cat:
+            stats['no_google_category'] += 1
+            continue
+
+        # Map Google category to our system
+        mapped_category = map_google_category(google_cat)
+
+        original_cat = restaurant.get('category', '')
+
+        # Determine final categories (specific and general)
+        final_specific, final_general = determine_final_categories(original_cat, mapped_category)
+
+        name_sim = round(name_sim, 2)
+        addr_sim = round(addr_sim, 2)
+
+        # Track the match
+        stats['matches'].append(MatchRecord(
+            name=restaurant.get('name'),
+            address=original_addr,
+            original_category=original_cat,
+            google_category=google_cat,
+            mapped_category=mapped_category,
+            final_cat_specific=final_specific,
+            final_cat_general=final_general,
+            name_similarity=name_sim,
+            address_similarity=addr_sim
+        ))
+
+        # Add Google data to restaurant (keep both original and Google)
+        if not dry_run:
+            restaurant['google_name'] = google_name
+            restaurant['google_address'] = google_addr
+            restaurant['google_category'] = google_cat
+            restaurant['google_category_mapped'] = mapped_category
+            restaurant['final_cat_specific'] = final_specific
+            restaurant['final_cat_general'] = final_general
+            restaurant['name_similarity'] = name_sim
+            restaurant['address_similarity'] = addr_sim
 
     # Update restaurants list if limited
     if limit:
@@ -206,8 +295,16 @@ def merge_data(original_data, google_data, dry_run=False, limit=None):
     return original_data, stats
 
 
-def print_stats(stats, show_all=False):
-    """Print merge statistics."""
+def print_stats(stats, show_all=False, by_confidence=False):
+    """
+    Print merge statistics.
+
+    Args:
+        stats: Statistics returned by merge_data()
+        show_all: Show every match instead of the first 50
+        by_confidence: Show the most confident matches first (name plus
+            address similarity) instead of input order
+    """
     print("\n" + "=" * 60)
     print("MERGE STATISTICS")
     print("=" * 60)
@@ -225,15 +322,23 @@ def print_stats(stats, show_all=False):
         print(f"MATCHED RESTAURANTS ({len(stats['matches'])} total):")
         print("-" * 60)
         display_count = len(stats['matches']) if show_all else min(50, len(stats['matches']))
-        for match in stats['matches'][:display_count]:
-            print(f"\n  {match['name'][:40]}")
-            print(f"    Address: {match['address'][:50]}")
-            print(f"    Original category:  {match['original_category']}")
-            print(f"    Google category:    {match['google_category']}")
-            print(f"    Mapped category:    {match['mapped_category']}")
-            print(f"    Final (specific):   {match['final_cat_specific']}")
-            print(f"    Final (general):    {match['final_cat_general']}")
-            print(f"    Name sim: {match['name_similarity']:.2f} | Addr sim: {match['address_similarity']:.2f}")
+        if by_confidence:
+            # Only the displayed matches need ordering, so avoid a full sort
+            shown = heapq.nlargest(
+                display_count, stats['matches'],
+                key=lambda m: m.name_similarity + m.address_similarity
+            )
+        else:
+            shown = stats['matches'][:display_count]
+        for match in shown:
+            print(f"\n  {match.name[:40]}")
+            print(f"    Address: {match.address[:50]}")
+            print(f"    Original category:  {match.original_category}")
+            print(f"    Google category:    {match.google_category}")
+            print(f"    Mapped category:    {match.mapped_category}")
+            print(f"    Final (specific):   {match.final_cat_specific}")
+            print(f"    Final (general):    {match.final_cat_general}")
+            print(f"    Name sim: {match.name_similarity:.2f} | Addr sim: {match.address_similarity:.2f}")
         if len(stats['matches']) > display_count:
             print(f"\n  ... and {len(stats['matches']) - display_count} more")
 
@@ -243,6 +348,8 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='Preview changes without saving')
     parser.add_argument('--limit', type=int, help='Only process first N restaurants (for testing)')
     parser.add_argument('--show-all', action='store_true', help='Show all matches in output')
+    parser.add_argument('--by-confidence', action='store_true', help='List the most confident matches first')
+    parser.add_argument('--workers', type=int, default=1, help='Processes to use for address matching')
     args = parser.parse_args()
 
     print("Loading data...")
@@ -258,22 +365,23 @@ def main():
         return
 
     original_data = load_json(ORIGINAL_FILE)
-    google_data = load_json(GOOGLE_FILE)
+    google_lookup = load_google_lookup(GOOGLE_FILE)
 
     print(f"Original restaurants: {len(original_data.get('restaurants', []))}")
-    print(f"Google results: {len(google_data.get('results', []))}")
+    print(f"Google results: {len(google_lookup)}")
     if args.limit:
         print(f"Processing limit: {args.limit}")
 
     # Merge
     merged_data, stats = merge_data(
         original_data,
-        google_data,
+        google_lookup,
         dry_run=args.dry_run,
-        limit=args.limit
+        limit=args.limit,
+        workers=args.workers
     )
 
-    print_stats(stats, show_all=args.show_all)
+    print_stats(stats, show_all=args.show_all, by_confidence=args.by_confidence)
 
     if not args.dry_run and stats['confident_matches'] > 0:
         # Save merged data
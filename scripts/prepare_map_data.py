@@ -7,8 +7,13 @@ output with geographic region-based colors and hierarchy for the
 collapsible legend.
 """
 
-import json
+import heapq
+from collections import Counter
+from itertools import islice
 from pathlib import Path
+
+import orjson
+
 from category_mapping import get_general_category, get_top_level_category, get_category_chain, SPECIFIC_TO_GENERAL
 
 # Neon color scheme — bright, saturated colors optimized for dark backgrounds
@@ -424,22 +429,30 @@ GEOGRAPHIC_COLORS = {
 DEFAULT_COLOR = [128, 128, 128]
 
 
+# Flattened views of GEOGRAPHIC_COLORS for get_color_for_category:
+# (general, specific) -> color, general -> base color, and specific -> color
+# from the first group that lists it
+_FLAT_COLOR = {}
+_BASE_COLOR = {}
+_SPECIFIC_COLOR = {}
+for _general, _group in GEOGRAPHIC_COLORS.items():
+    _BASE_COLOR[_general] = _group.get("_base", DEFAULT_COLOR)
+    for _specific, _color in _group.items():
+        if _specific != "_base":
+            _FLAT_COLOR[(_general, _specific)] = _color
+            _SPECIFIC_COLOR.setdefault(_specific, _color)
+del _general, _group, _specific, _color
+
+
 def get_color_for_category(specific, general):
     """Get the color for a specific category based on its general group."""
-    # First try to find the specific category in its general group
-    if general in GEOGRAPHIC_COLORS:
-        group = GEOGRAPHIC_COLORS[general]
-        if specific in group:
-            return group[specific]
-        # Return the base color for the group
-        return group.get("_base", DEFAULT_COLOR)
+    # If the general group is known, use the category's color in it, or
+    # else the group's base color
+    if general in _BASE_COLOR:
+        return _FLAT_COLOR.get((general, specific), _BASE_COLOR[general])
 
-    # Try to find the specific category directly
-    for group_name, group in GEOGRAPHIC_COLORS.items():
-        if specific in group:
-            return group[specific]
-
-    return DEFAULT_COLOR
+    # Otherwise find the specific category in any group
+    return _SPECIFIC_COLOR.get(specific, DEFAULT_COLOR)
 
 
 def prepare_map_data(enriched_path, original_path, output_path):
@@ -447,92 +460,111 @@ def prepare_map_data(enriched_path, original_path, output_path):
     Prepare map data from enriched restaurant data.
     """
     print(f"Loading enriched data from: {enriched_path}")
-    with open(enriched_path, 'r', encoding='utf-8') as f:
-        enriched_data = json.load(f)
-
-    print(f"Loading original data from: {original_path}")
-    with open(original_path, 'r', encoding='utf-8') as f:
-        original_data = json.load(f)
+    with open(enriched_path, 'rb') as f:
+        enriched_data = orjson.loads(f.read())
 
-    # Create a lookup for enriched data
+    # Only the final category is needed from each enriched record, so keep
+    # just that and drop the full records before loading the original data
     enriched_lookup = {}
     for r in enriched_data.get('restaurants', []):
-        key = f"{r.get('name')}|{r.get('address')}"
-        enriched_lookup[key] = r
+        key = (r.get('name'), r.get('address'))
+        enriched_lookup[key] = r.get('final_cat_specific')
+    del enriched_data
+
+    print(f"Loading original data from: {original_path}")
+    with open(original_path, 'rb') as f:
+        original_data = orjson.loads(f.read())
 
     print(f"Enriched restaurants: {len(enriched_lookup)}")
     print(f"Original restaurants: {len(original_data.get('restaurants', []))}")
 
-    # Pre-compute which categories have children (are parents in SPECIFIC_TO_GENERAL)
-    categories_with_children = set()
-    for cat, parent in SPECIFIC_TO_GENERAL.items():
-        categories_with_children.add(parent)
-
-    # Process restaurants
-    restaurants = []
-    # Track counts at every level of the hierarchy
-    all_counts = {}  # {category: count} (includes descendants)
+    # Pre-compute which categories get an "(Unspecified)" entry: those that
+    # have children (are parents in SPECIFIC_TO_GENERAL) and aren't already
+    # an "(Unspecified)" name
+    needs_unspecified = frozenset(
+        cat for cat in set(SPECIFIC_TO_GENERAL.values())
+        if not cat.endswith('(Unspecified)')
+    )
+
+    # Records from preprocess_data.py always carry
+    # name/address/boro/position/category, so they are indexed directly
+    original_restaurants = original_data.get('restaurants', [])
+
+    # Pass 1: pick each restaurant's category, using the final category from
+    # enriched data or falling back to the original
+    enriched_get = enriched_lookup.get
+    specifics = [
+        enriched_get((r['name'], r['address'])) or r['category']
+        for r in original_restaurants
+    ]
+
+    # Pass 2: everything else depends only on the category, and there are
+    # only a few hundred distinct categories, so resolve each one once (in
+    # first-seen order) and weight its counts by the number of restaurants
+    all_counts = Counter()  # {category: count} (includes descendants)
     colors = {}  # {category: color}
-
-    for r in original_data.get('restaurants', []):
-        key = f"{r.get('name')}|{r.get('address')}"
-
-        # Get enriched data if available
-        enriched = enriched_lookup.get(key, {})
-
-        # Use final categories from enriched data, or fall back to original
-        specific = enriched.get('final_cat_specific') or r.get('category')
+    display_info = {}  # {category: (display_specific, top_level)}
+    top_level_cats = set()
+    for specific, count in Counter(specifics).items():
+        # Get the full hierarchy chain, top-level category and color (from
+        # the category's place under its immediate parent)
+        chain = get_category_chain(specific)
+        top_level = get_top_level_category(specific)
+        color = get_color_for_category(specific, get_general_category(specific))
 
         # If this category has children and doesn't already have "(Unspecified)",
         # rename it to "(Unspecified)" so it shows as a distinct entry
-        if specific in categories_with_children and not specific.endswith('(Unspecified)'):
-            unspecified_name = f"{specific} (Unspecified)"
-            # Use the parent color for the unspecified variant
-            immediate_parent = get_general_category(specific)
-            color = get_color_for_category(specific, immediate_parent)
-            colors[unspecified_name] = color
-            # The restaurant gets the unspecified category
-            display_specific = unspecified_name
+        if specific in needs_unspecified:
+            # The restaurant gets the unspecified category, in the same
+            # color. This takes precedence over the color of a category
+            # that was already named "... (Unspecified)" in the data.
+            display_specific = f"{specific} (Unspecified)"
+            colors[display_specific] = color
+            colors[specific] = color
         else:
             display_specific = specific
+            colors.setdefault(specific, color)
 
-        # Get the full hierarchy chain and top-level category (using original specific)
-        chain = get_category_chain(specific)
-        top_level = get_top_level_category(specific)
-        immediate_parent = get_general_category(specific)
-
-        # Get color for this category
-        color = get_color_for_category(specific, immediate_parent)
-        colors[specific] = color
-        if display_specific != specific:
-            colors[display_specific] = color
-
-        # Track counts for all levels in the chain
+        # Track counts for all levels in the chain, plus the unspecified variant
         for cat in chain:
-            all_counts[cat] = all_counts.get(cat, 0) + 1
-        # Also track the unspecified variant
+            all_counts[cat] += count
         if display_specific != specific:
-            all_counts[display_specific] = all_counts.get(display_specific, 0) + 1
-
-        restaurant = {
-            'position': r.get('position'),
-            'name': r.get('name'),
-            'address': r.get('address'),
-            'boro': r.get('boro'),
+            all_counts[display_specific] += count
+
+        display_info[specific] = (display_specific, top_level)
+        # Record the top-level category (skipping categories that are only
+        # a generated-style "(Unspecified)" name with no place in the hierarchy)
+        if specific and (specific in SPECIFIC_TO_GENERAL or not specific.endswith('(Unspecified)')):
+            top_level_cats.add(top_level)
+
+    # Pass 3: build the output records
+    restaurants = [
+        {
+            'position': r['position'],
+            'name': r['name'],
+            'address': r['address'],
+            'boro': r['boro'],
             'category': display_specific,
             'general': top_level,  # Use top-level for filtering
         }
-        restaurants.append(restaurant)
+        for r, (display_specific, top_level) in zip(
+            original_restaurants, map(display_info.__getitem__, specifics))
+    ]
+
+    # Invert SPECIFIC_TO_GENERAL once so each node's children are a lookup
+    parent_to_children = {}
+    for cat, parent in SPECIFIC_TO_GENERAL.items():
+        parent_to_children.setdefault(parent, []).append(cat)
 
     def build_nested_hierarchy(parent_cat, depth=0, max_depth=3):
         """Recursively build nested hierarchy for a category."""
         if depth >= max_depth:
             return None
 
-        # Find all direct children of this parent from SPECIFIC_TO_GENERAL
+        # Find all direct children of this parent that have restaurants
         children = {}
-        for cat, parent in SPECIFIC_TO_GENERAL.items():
-            if parent == parent_cat and cat in all_counts:
+        for cat in parent_to_children.get(parent_cat, ()):
+            if cat in all_counts:
                 children[cat] = all_counts[cat]
 
         # Only add "(Unspecified)" when there are other real children to differentiate from
@@ -562,16 +594,10 @@ def prepare_map_data(enriched_path, original_path, output_path):
 
     # Build hierarchy starting from top-level categories
     hierarchy = {}
-    top_level_cats = set()
-
-    # Find all top-level categories (skip generated "(Unspecified)" entries)
-    for cat in all_counts:
-        if cat.endswith('(Unspecified)') and cat not in SPECIFIC_TO_GENERAL:
-            continue  # Skip generated unspecified entries
-        top = get_top_level_category(cat)
-        top_level_cats.add(top)
 
-    for top_cat in top_level_cats:
+    # Visit top-level categories by total count so the hierarchy comes out
+    # sorted without rebuilding it afterwards
+    for top_cat in sorted(top_level_cats, key=all_counts.__getitem__, reverse=True):
         if top_cat not in all_counts:
             continue
 
@@ -585,9 +611,6 @@ def prepare_map_data(enriched_path, original_path, output_path):
         if children:
             hierarchy[top_cat]['children'] = children
 
-    # Sort hierarchy by total count
-    hierarchy = dict(sorted(hierarchy.items(), key=lambda x: -x[1]['count']))
-
     output_data = {
         'restaurants': restaurants,
         'colors': colors,
@@ -595,8 +618,12 @@ def prepare_map_data(enriched_path, original_path, output_path):
     }
 
     print(f"\nWriting output to: {output_path}")
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f)
+    # orjson already writes compact separators and raw UTF-8 (no \uXXXX
+    # escapes for names like "Café"), which is what the map loads. Keep it
+    # that way: don't add OPT_INDENT_2 here, the file is machine-read only.
+    # OPT_NON_STR_KEYS keeps json's handling of a missing (None) category key.
+    with open(output_path, 'wb') as f:
+        f.write(orjson.dumps(output_data, option=orjson.OPT_NON_STR_KEYS))
 
     import os
     file_size = os.path.getsize(output_path) / (1024 * 1024)
@@ -605,7 +632,7 @@ def prepare_map_data(enriched_path, original_path, output_path):
     def print_hierarchy(node, indent=0):
         """Recursively print the hierarchy."""
         children = node.get('children', {})
-        items = list(children.items())[:5]
+        items = heapq.nlargest(5, children.items(), key=lambda kv: kv[1]['count'])
         for name, data in items:
             print(f"{'  ' * indent}- {name}: {data['count']}")
             if 'children' in data:
@@ -614,7 +641,7 @@ def prepare_map_data(enriched_path, original_path, output_path):
             print(f"{'  ' * indent}... and {len(children) - 5} more")
 
     print(f"\n--- Category Hierarchy ---")
-    for general, data in list(hierarchy.items())[:15]:
+    for general, data in islice(hierarchy.items(), 15):
         print(f"\n{general} ({data['count']})")
         print_hierarchy(data, indent=1)
 
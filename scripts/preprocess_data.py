@@ -11,15 +11,22 @@ This script:
 6. Outputs a minimal JSON file for web visualization
 """
 
-import json
+import argparse
+import mmap
 import os
 import re
 import random
+import sys
 import math
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 import colorsys
 
+import orjson
+
 # Country/ethnicity keywords to look for in restaurant names
 # Maps keyword patterns to category names
 NAME_TO_CATEGORY_PATTERNS = {
@@ -237,6 +244,21 @@ CUISINE_TO_CATEGORY = {
     "Jewish/Kosher": "Jewish/Kosher",
 }
 
+# Per-cuisine follow-up checks, worked out once instead of per restaurant
+_NEEDS_HOTEL_CHECK = 1  # Continental: hotel restaurants become Hotel Food
+_NEEDS_NAME_EXTRACT = 2  # (Unspecified): look for a country in the name
+
+# Keys and categories are interned so per-restaurant interning of the
+# parsed cuisine strings resolves to these same objects
+_CUISINE_INFO = {
+    sys.intern(cuisine): (
+        sys.intern(category),
+        (_NEEDS_HOTEL_CHECK if category == "Continental European" else 0)
+        | (_NEEDS_NAME_EXTRACT if "(Unspecified)" in category else 0),
+    )
+    for cuisine, category in CUISINE_TO_CATEGORY.items()
+}
+
 # Cuisines to exclude (generic food types, not ethnic cuisines)
 EXCLUDED_CUISINES = {
     "Bakery Products/Desserts",
@@ -306,6 +328,79 @@ BAR_PATTERNS = [
     r'\bdrinking\b',
 ]
 
+# Compiled once at import; these are searched for every restaurant
+_NAME_TO_CATEGORY_RES = [(re.compile(p), cat) for p, cat in NAME_TO_CATEGORY_PATTERNS.items()]
+
+# All name patterns fused into one alternation, so a name with no country
+# keyword (the common case) costs a single search. Every pattern starts with
+# \b and a letter, so branches are only tried where a word begins.
+_NAME_ALT_RE = re.compile(r'\b(?=\w)(?:' + '|'.join(
+    f'(?P<p{i}>{p})' for i, p in enumerate(NAME_TO_CATEGORY_PATTERNS)
+) + ')')
+_NAME_GROUP_INDEX = {f'p{i}': i for i in range(len(_NAME_TO_CATEGORY_RES))}
+
+# Hotel and bar keywords are scanned in one pass per name. The re module
+# already merges the shared prefixes of the alternatives, so this runs as
+# fast as a trie of the literal keywords would.
+_HOTEL_RE = re.compile('|'.join(f'(?:{p})' for p in HOTEL_PATTERNS))
+_BAR_RE = re.compile('|'.join(f'(?:{p})' for p in BAR_PATTERNS))
+
+# Street orientation (see get_street_orientation)
+# Most street names are decided by a single word, so those are looked up
+# per word; only the multi-word and numbered forms need a regex.
+_WORD_RE = re.compile(r'\w+')
+
+_STREET_WORD_ORIENTATION = {
+    # Diagonal streets - skip offset entirely
+    'broadway': 'DIAG', 'bowery': 'DIAG',
+
+    # North-South streets (Avenues)
+    # These get E/W offset based on odd/even
+    'avenue': 'NS', 'ave': 'NS', 'av': 'NS',
+    'boulevard': 'NS', 'blvd': 'NS',
+
+    # East-West streets (Streets, Roads, etc.)
+    # These get N/S offset based on odd/even
+    'street': 'EW', 'st': 'EW',
+    'place': 'EW', 'pl': 'EW',
+    'road': 'EW', 'rd': 'EW',
+    'way': 'EW',
+    'lane': 'EW', 'ln': 'EW',
+    'drive': 'EW', 'dr': 'EW',
+    'court': 'EW', 'ct': 'EW',
+    'terrace': 'EW', 'ter': 'EW',
+}
+
+_DIAGONAL_RE = re.compile(r'\bpark\s+ave\s+south\b')
+_NS_RE = re.compile(
+    r'\b\d+(?:st|nd|rd|th)\s+ave'  # "5th Ave" etc
+    r'|^[a-z]\b'  # Single letter avenues (A, B, C, D in Manhattan)
+)
+_EW_RE = re.compile(
+    r'^\d+(?:st|nd|rd|th)\s+st'  # "42nd St" etc
+    r'|\b(?:east|west|e|w)\s+\d+'  # "East 42nd", "W 23rd"
+)
+
+# Numbered streets without explicit suffix, e.g. "42" or "EAST 42"
+_BARE_NUMBER_RE = re.compile(r'^(east|west|e|w)?\s*\d+$')
+
+_BUILDING_NUMBER_RE = re.compile(r'^(\d+)')
+
+
+@dataclass(slots=True)
+class Restaurant:
+    """A restaurant kept for the map; lon/lat are adjusted in place by the offset passes."""
+    lon: float
+    lat: float
+    name: str
+    cuisine: str
+    category: str
+    boro: str
+    # Kept apart for the street-side offset; joined into 'address'
+    # when the output is written
+    building: str
+    street: str
+
 
 def generate_colors(n):
     """Generate n visually distinct colors using HSL color space."""
@@ -323,28 +418,18 @@ def generate_colors(n):
     return colors
 
 
-def get_building_number(address):
-    """Extract the building number from an address string."""
-    if not address:
+def get_building_number(building):
+    """Extract the building number from a DOHMH building field (e.g. "12-34" -> 12)."""
+    if not building:
         return None
     # Match leading digits (building number)
-    match = re.match(r'^(\d+)', address.strip())
+    match = _BUILDING_NUMBER_RE.match(building.strip())
     if match:
         return int(match.group(1))
     return None
 
 
-def get_street_name(address):
-    """Extract the street name from an address string (everything after the building number)."""
-    if not address:
-        return None
-    # Remove building number and get the rest
-    match = re.match(r'^\d+\s+(.+)$', address.strip())
-    if match:
-        return match.group(1).strip()
-    return address.strip()
-
-
+@lru_cache(maxsize=None)
 def get_street_orientation(street_name):
     """
     Determine if a street runs East-West or North-South based on its name.
@@ -354,60 +439,48 @@ def get_street_orientation(street_name):
         'NS' for North-South streets (apply E/W offset)
         'DIAG' for diagonal streets (skip offset)
         None if orientation cannot be determined
+
+    Cached: there are far fewer distinct street names than restaurants.
     """
     if not street_name:
         return None
 
     street_lower = street_name.lower()
 
-    # Diagonal streets - skip offset entirely
-    diagonal_patterns = [
-        r'\bbroadway\b',
-        r'\bbowery\b',
-        r'\bpark\s+ave\s+south\b',
-    ]
-    for pattern in diagonal_patterns:
-        if re.search(pattern, street_lower):
-            return 'DIAG'
+    # Orientation words anywhere in the name; diagonal beats NS beats EW
+    found = {_STREET_WORD_ORIENTATION.get(word) for word in _WORD_RE.findall(street_lower)}
 
-    # North-South streets (Avenues)
-    # These get E/W offset based on odd/even
-    ns_patterns = [
-        r'\bavenue\b', r'\bave\b', r'\bav\b',
-        r'\bboulevard\b', r'\bblvd\b',
-        r'\b\d+(st|nd|rd|th)\s+ave',  # "5th Ave" etc
-        r'^[a-z]\b',  # Single letter avenues (A, B, C, D in Manhattan)
-    ]
-    for pattern in ns_patterns:
-        if re.search(pattern, street_lower):
-            return 'NS'
+    if 'DIAG' in found or _DIAGONAL_RE.search(street_lower):
+        return 'DIAG'
 
-    # East-West streets (Streets, Roads, etc.)
-    # These get N/S offset based on odd/even
-    ew_patterns = [
-        r'\bstreet\b', r'\bst\b',
-        r'\bplace\b', r'\bpl\b',
-        r'\broad\b', r'\brd\b',
-        r'\bway\b',
-        r'\blane\b', r'\bln\b',
-        r'\bdrive\b', r'\bdr\b',
-        r'\bcourt\b', r'\bct\b',
-        r'\bterrace\b', r'\bter\b',
-        r'^\d+(st|nd|rd|th)\s+st',  # "42nd St" etc
-        r'\b(east|west|e|w)\s+\d+',  # "East 42nd", "W 23rd"
-    ]
-    for pattern in ew_patterns:
-        if re.search(pattern, street_lower):
-            return 'EW'
+    if 'NS' in found or _NS_RE.search(street_lower):
+        return 'NS'
+
+    if 'EW' in found or _EW_RE.search(street_lower):
+        return 'EW'
 
     # Check for numbered streets without explicit suffix (common in address data)
     # If it's just a number like "42" or "EAST 42", assume it's a street (E-W)
-    if re.match(r'^(east|west|e|w)?\s*\d+$', street_lower.strip()):
+    if _BARE_NUMBER_RE.match(street_lower.strip()):
         return 'EW'
 
     return None
 
 
+# Offset amount: ~0.00010 degrees ≈ 10 meters at NYC latitude
+_SIDE_OFFSET = 0.00010
+
+# Orientation -> (lon, lat) offsets for (even, odd) building numbers
+_STREET_SIDE_OFFSETS = {
+    # E-W street: offset in latitude (N/S direction)
+    # Odd = North (+lat), Even = South (-lat)
+    'EW': ((0.0, -_SIDE_OFFSET), (0.0, _SIDE_OFFSET)),
+    # N-S avenue: offset in longitude (E/W direction)
+    # Odd = West (-lon), Even = East (+lon)
+    'NS': ((_SIDE_OFFSET, 0.0), (-_SIDE_OFFSET, 0.0)),
+}
+
+
 def apply_street_side_offset(restaurants):
     """
     Offset restaurants to the correct side of the street based on:
@@ -421,90 +494,89 @@ def apply_street_side_offset(restaurants):
     We apply a perpendicular offset of ~10 meters to move points
     from street centerline to building side.
     """
-    # Offset amount: ~0.00010 degrees ≈ 10 meters at NYC latitude
-    offset_amount = 0.00010
-
     offset_count = 0
     skipped_diagonal = 0
     skipped_unknown = 0
 
     for restaurant in restaurants:
-        address = restaurant.get('address', '')
-        building_num = get_building_number(address)
-        street_name = get_street_name(address)
-        orientation = get_street_orientation(street_name)
-
+        building_num = get_building_number(restaurant.building)
         if building_num is None:
             continue
 
-        if orientation == 'DIAG':
-            skipped_diagonal += 1
-            continue
-
-        if orientation is None:
-            skipped_unknown += 1
-            continue
-
-        is_odd = building_num % 2 == 1
+        street_name = restaurant.street
+        orientation = get_street_orientation(street_name.strip() if street_name else None)
+        offsets = _STREET_SIDE_OFFSETS.get(orientation)
 
-        if orientation == 'EW':
-            # E-W street: offset in latitude (N/S direction)
-            # Odd = North (+lat), Even = South (-lat)
-            if is_odd:
-                restaurant['position'][1] += offset_amount
+        if offsets is None:
+            if orientation == 'DIAG':
+                skipped_diagonal += 1
             else:
-                restaurant['position'][1] -= offset_amount
-        else:  # NS
-            # N-S avenue: offset in longitude (E/W direction)
-            # Odd = West (-lon), Even = East (+lon)
-            if is_odd:
-                restaurant['position'][0] -= offset_amount
-            else:
-                restaurant['position'][0] += offset_amount
+                skipped_unknown += 1
+            continue
 
+        offset_lon, offset_lat = offsets[building_num & 1]
+        restaurant.lon += offset_lon
+        restaurant.lat += offset_lat
         offset_count += 1
 
     return offset_count, skipped_diagonal, skipped_unknown
 
 
+@lru_cache(maxsize=None)
+def _jitter_offsets(n):
+    """
+    Offsets for a group of n restaurants sharing one location.
+
+    Every group of the same size gets the same pattern, and there are only a
+    handful of distinct sizes, so the trig is done once per size.
+
+    Returns:
+        Tuple of (offset_x, offset_y) for each position in the group
+    """
+    # Jitter amount: ~0.00008 degrees ≈ 8 meters at NYC latitude
+    jitter_amount = 0.00008
+    offsets = []
+
+    # Arrange points in a circle around the original location
+    for j in range(n):
+        if n <= 6:
+            # For small groups, use evenly spaced circle
+            angle = (2 * math.pi * j) / n
+            offset_x = jitter_amount * math.cos(angle)
+            offset_y = jitter_amount * math.sin(angle)
+        else:
+            # For larger groups, use spiral pattern
+            radius = jitter_amount * (1 + j / n)
+            angle = (2 * math.pi * j) / 6  # Golden spiral-ish
+            offset_x = radius * math.cos(angle)
+            offset_y = radius * math.sin(angle)
+        offsets.append((offset_x, offset_y))
+
+    return tuple(offsets)
+
+
 def apply_jitter(restaurants):
     """
     Apply small spatial offsets to restaurants sharing the same coordinates.
     This prevents overlapping points and creates a cleaner pointillism effect.
     Called AFTER street-side offset.
     """
-    # Group restaurants by coordinates (rounded to 6 decimal places)
+    # Group restaurants by coordinates (rounded to 6 decimal places). The
+    # rounded microdegrees are packed into one int key; latitude is positive
+    # and below 2**32 microdegrees, so it fits in the low 32 bits.
     coord_groups = defaultdict(list)
-    for i, r in enumerate(restaurants):
-        # Round coordinates to group nearby points
-        key = (round(r['position'][0], 6), round(r['position'][1], 6))
-        coord_groups[key].append(i)
+    for r in restaurants:
+        coord_groups[(round(r.lon * 1e6) << 32) | round(r.lat * 1e6)].append(r)
 
     # Apply jitter to groups with multiple restaurants
-    # Jitter amount: ~0.00008 degrees ≈ 8 meters at NYC latitude
-    jitter_amount = 0.00008
     jittered_count = 0
 
-    for coord, indices in coord_groups.items():
-        if len(indices) > 1:
-            jittered_count += len(indices)
-            # Arrange points in a circle around the original location
-            n = len(indices)
-            for j, idx in enumerate(indices):
-                if n <= 6:
-                    # For small groups, use evenly spaced circle
-                    angle = (2 * math.pi * j) / n
-                    offset_x = jitter_amount * math.cos(angle)
-                    offset_y = jitter_amount * math.sin(angle)
-                else:
-                    # For larger groups, use spiral pattern
-                    radius = jitter_amount * (1 + j / n)
-                    angle = (2 * math.pi * j) / 6  # Golden spiral-ish
-                    offset_x = radius * math.cos(angle)
-                    offset_y = radius * math.sin(angle)
-
-                restaurants[idx]['position'][0] += offset_x
-                restaurants[idx]['position'][1] += offset_y
+    for group in coord_groups.values():
+        if len(group) > 1:
+            jittered_count += len(group)
+            for r, (offset_x, offset_y) in zip(group, _jitter_offsets(len(group))):
+                r.lon += offset_x
+                r.lat += offset_y
 
     return jittered_count
 
@@ -691,26 +763,24 @@ CATEGORY_COLORS = {
 }
 
 
+@lru_cache(maxsize=None)
 def is_hotel(name):
     """Check if the restaurant name indicates it's a hotel."""
     if not name:
         return False
-    name_lower = name.lower()
-    for pattern in HOTEL_PATTERNS:
-        if re.search(pattern, name_lower):
-            return True
-    return False
+    return _HOTEL_RE.search(name.lower()) is not None
 
 
+@lru_cache(maxsize=None)
 def is_bar(name):
-    """Check if the restaurant name indicates it's a bar."""
+    """
+    Check if the restaurant name indicates it's a bar.
+
+    Cached, as chains repeat the same name across many locations.
+    """
     if not name:
         return False
-    name_lower = name.lower()
-    for pattern in BAR_PATTERNS:
-        if re.search(pattern, name_lower):
-            return True
-    return False
+    return _BAR_RE.search(name.lower()) is not None
 
 
 def extract_category_from_name(name, default_category):
@@ -721,39 +791,169 @@ def extract_category_from_name(name, default_category):
     if not name or "(Unspecified)" not in default_category:
         return default_category
 
-    name_lower = name.lower()
+    return _category_from_name(name.lower(), default_category)
+
+
+def _category_from_name(name_lower, default_category):
+    """
+    extract_category_from_name() without the guards, for callers that have
+    already checked the category is "(Unspecified)" and the name is set.
+    """
+    match = _NAME_ALT_RE.search(name_lower)
+    if not match:
+        return default_category
 
-    for pattern, category in NAME_TO_CATEGORY_PATTERNS.items():
-        if re.search(pattern, name_lower):
+    # The fused search finds the leftmost keyword, but pattern order decides
+    # priority, so an earlier pattern matching further along still wins
+    index = _NAME_GROUP_INDEX[match.lastgroup]
+    for pattern, category in _NAME_TO_CATEGORY_RES[:index]:
+        if pattern.search(name_lower):
             return category
 
-    return default_category
+    return _NAME_TO_CATEGORY_RES[index][1]
 
 
-def preprocess_data(input_path: str, output_path: str):
+def load_features(input_path):
+    """
+    Parse the features list from the DOHMH GeoJSON file.
+
+    The file is memory-mapped and parsed in place, so the raw 352MB of JSON
+    is never copied into a Python string alongside the parsed features.
+    """
+    with open(input_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return orjson.loads(view)['features']
+
+
+def write_output(output_path, restaurants, colors, categories, counts):
+    """
+    Write the visualization JSON one restaurant at a time.
+
+    Serializing the whole output at once holds a second, encoded copy of
+    every restaurant in memory; streaming the records keeps that to one.
+
+    Args:
+        output_path: Destination JSON file
+        restaurants: Restaurant records from preprocess_data()
+        colors: Category -> [r, g, b]
+        categories: Sorted category names
+        counts: Category -> restaurant count
+    """
+    with open(output_path, 'wb', buffering=1 << 20) as f:
+        f.write(b'{"restaurants":[')
+        for i, r in enumerate(restaurants):
+            if i:
+                f.write(b',')
+            f.write(orjson.dumps({
+                'position': [r.lon, r.lat],
+                'name': r.name,
+                'cuisine': r.cuisine,
+                'category': r.category,
+                'boro': r.boro,
+                'address': f"{r.building} {r.street}".strip(),
+            }))
+        f.write(b'],"colors":')
+        f.write(orjson.dumps(colors))
+        f.write(b',"categories":')
+        f.write(orjson.dumps(categories))
+        f.write(b',"counts":')
+        f.write(orjson.dumps(counts))
+        f.write(b'}')
+
+
+def classify_restaurant(cuisine, name):
+    """
+    Work out the map category for one restaurant.
+
+    Args:
+        cuisine: DOHMH cuisine_description (may be None)
+        name: Restaurant name (dba)
+
+    Returns:
+        (category, outcome) tuple. outcome is 'bar', 'hotel' or 'name' when
+        that rule set the category and None for a plain cuisine mapping.
+        Skipped restaurants get category None and outcome 'excluded' or
+        'unmapped'.
+    """
+    # Check if it's a bar first
+    if is_bar(name):
+        return "Bar", 'bar'
+
+    # Check if excluded cuisine
+    if not cuisine or cuisine in EXCLUDED_CUISINES:
+        return None, 'excluded'
+
+    # Map cuisine to category
+    info = _CUISINE_INFO.get(cuisine)
+    if info is None:
+        return None, 'unmapped'
+    category, checks = info
+
+    # For Continental, check if it's a hotel
+    if checks & _NEEDS_HOTEL_CHECK:
+        if is_hotel(name):
+            return "Hotel Food", 'hotel'
+
+    # For Unspecified categories, try to extract from name
+    # (the flag already guarantees an "(Unspecified)" category)
+    elif checks & _NEEDS_NAME_EXTRACT and name:
+        new_category = _category_from_name(name.lower(), category)
+        if new_category != category:
+            return new_category, 'name'
+
+    return category, None
+
+
+def _classify_chunk(pairs):
+    """Worker entry point: classify a list of (cuisine, name) pairs."""
+    return [classify_restaurant(cuisine, name) for cuisine, name in pairs]
+
+
+def classify_restaurants(pairs, workers=1):
+    """
+    Classify many restaurants, optionally in parallel.
+
+    Args:
+        pairs: List of (cuisine, name) tuples
+        workers: Number of processes to spread the work over (1 = serial)
+
+    Returns:
+        List of classify_restaurant() results, aligned with pairs
+    """
+    if workers <= 1 or len(pairs) < 2 * workers:
+        return _classify_chunk(pairs)
+
+    chunk_size = -(-len(pairs) // workers)
+    chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [result for chunk in executor.map(_classify_chunk, chunks) for result in chunk]
+
+
+def preprocess_data(input_path: str, output_path: str, workers: int = 1):
     """
     Process the DOHMH GeoJSON file and output optimized JSON for visualization.
+
+    Args:
+        input_path: DOHMH GeoJSON file
+        output_path: Destination JSON file
+        workers: Processes to use for categorising restaurants (1 = serial)
     """
     print(f"Loading GeoJSON from: {input_path}")
     print("This may take a moment for the 352MB file...")
 
-    with open(input_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    features = load_features(input_path)
+    total_features = len(features)
 
-    print(f"Loaded {len(data['features'])} features")
+    print(f"Loaded {total_features} features")
 
     seen_camis = set()
-    restaurants = []
-    excluded_count = 0
     invalid_geo_count = 0
     duplicate_count = 0
-    unmapped_cuisines = set()
-    category_counts = {}
-    bar_count = 0
-    hotel_count = 0
-    name_extracted_count = 0
 
-    for feature in data['features']:
+    # First pass: geometry and dedup only, which are cheap and order-dependent
+    kept = []
+    pairs = []
+    for feature in features:
         props = feature.get('properties', {})
         geom = feature.get('geometry')
 
@@ -768,12 +968,8 @@ def preprocess_data(input_path: str, output_path: str):
             continue
 
         lon, lat = coords[0], coords[1]
-        if (lon == 0 and lat == 0) or lon is None or lat is None:
-            invalid_geo_count += 1
-            continue
-
-        # NYC bounding box check
-        if not (-74.3 < lon < -73.7 and 40.4 < lat < 41.0):
+        # NYC bounding box check; (0, 0) placeholders fall outside it too
+        if lon is None or lat is None or not (-74.3 < lon < -73.7 and 40.4 < lat < 41.0):
             invalid_geo_count += 1
             continue
 
@@ -784,55 +980,59 @@ def preprocess_data(input_path: str, output_path: str):
             continue
         seen_camis.add(camis)
 
-        cuisine = props.get('cuisine_description')
-        name = props.get('dba', 'Unknown')
+        kept.append((props, lon, lat))
+        pairs.append((props.get('cuisine_description'), props.get('dba', 'Unknown')))
 
-        # Check if it's a bar first
-        if is_bar(name):
-            category = "Bar"
-            bar_count += 1
-        # Check if excluded cuisine
-        elif not cuisine or cuisine in EXCLUDED_CUISINES:
+    # Only the unique, located restaurants are needed from here on
+    del features
+
+    # Second pass: the regex-heavy categorisation, optionally in parallel
+    outcomes = classify_restaurants(pairs, workers)
+
+    restaurants = []
+    excluded_count = 0
+    unmapped_cuisines = set()
+    category_counts = Counter()
+    bar_count = 0
+    hotel_count = 0
+    name_extracted_count = 0
+
+    for (props, lon, lat), (cuisine, name), (category, outcome) in zip(kept, pairs, outcomes):
+        if category is None:
+            if outcome == 'unmapped':
+                unmapped_cuisines.add(cuisine)
             excluded_count += 1
             continue
-        else:
-            # Map cuisine to category
-            category = CUISINE_TO_CATEGORY.get(cuisine)
-            if not category:
-                unmapped_cuisines.add(cuisine)
-                excluded_count += 1
-                continue
-
-            # For Continental, check if it's a hotel
-            if category == "Continental European" and is_hotel(name):
-                category = "Hotel Food"
-                hotel_count += 1
 
-            # For Unspecified categories, try to extract from name
-            if "(Unspecified)" in category:
-                new_category = extract_category_from_name(name, category)
-                if new_category != category:
-                    name_extracted_count += 1
-                    category = new_category
+        if outcome == 'bar':
+            bar_count += 1
+        elif outcome == 'hotel':
+            hotel_count += 1
+        elif outcome == 'name':
+            name_extracted_count += 1
 
         # Track counts
-        category_counts[category] = category_counts.get(category, 0) + 1
-
-        restaurant = {
-            'position': [lon, lat],
-            'name': name,
-            'cuisine': cuisine if cuisine else 'Bar',
-            'category': category,
-            'boro': props.get('boro', ''),
-            'address': f"{props.get('building', '')} {props.get('street', '')}".strip(),
-        }
-        restaurants.append(restaurant)
+        category_counts[category] += 1
+
+        boro = props.get('boro', '')
+        street = props.get('street', '')
+        # Cuisine, boro and street come from small sets of values, so
+        # interning shares one string object across all restaurants
+        restaurants.append(Restaurant(
+            lon, lat,
+            name,
+            sys.intern(cuisine) if cuisine else 'Bar',
+            category,
+            sys.intern(boro) if boro else boro,
+            props.get('building', ''),
+            sys.intern(street) if street else street,
+        ))
 
     # Apply jitter to spread out overlapping restaurants
     jittered_count = apply_jitter(restaurants)
 
     print(f"\n--- Processing Summary ---")
-    print(f"Total features processed: {len(data['features'])}")
+    print(f"Total features processed: {total_features}")
     print(f"Invalid geometry: {invalid_geo_count}")
     print(f"Duplicates removed: {duplicate_count}")
     print(f"Excluded (non-ethnic or unmapped): {excluded_count}")
@@ -850,7 +1050,7 @@ def preprocess_data(input_path: str, output_path: str):
             print(f"  {c}")
 
     print(f"\n--- Category Distribution ({len(category_counts)} categories) ---")
-    for category, count in sorted(category_counts.items(), key=lambda x: -x[1]):
+    for category, count in category_counts.most_common():
         print(f"  {category}: {count}")
 
     # Build color mapping
@@ -871,16 +1071,8 @@ def preprocess_data(input_path: str, output_path: str):
             colors[cat] = generated[i]
             print(f"  {cat}: {generated[i]}")
 
-    output_data = {
-        'restaurants': restaurants,
-        'colors': colors,
-        'categories': sorted(all_categories),
-        'counts': category_counts,
-    }
-
     print(f"\nWriting output to: {output_path}")
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f)
+    write_output(output_path, restaurants, colors, sorted(all_categories), category_counts)
 
     file_size = os.path.getsize(output_path) / (1024 * 1024)
     print(f"Output file size: {file_size:.2f} MB")
@@ -889,6 +1081,10 @@ def preprocess_data(input_path: str, output_path: str):
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Preprocess DOHMH restaurant data for the map')
+    parser.add_argument('--workers', type=int, default=1, help='Processes to use for categorising restaurants')
+    args = parser.parse_args()
+
     script_dir = Path(__file__).parent
     project_dir = script_dir.parent
 
@@ -902,5 +1098,5 @@ if __name__ == '__main__':
     output_file = project_dir / 'data' / 'restaurants.json'
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    preprocess_data(str(input_file), str(output_file))
+    preprocess_data(str(input_file), str(output_file), workers=args.workers)
     print("\nDone! Refresh the browser to see updated data.")
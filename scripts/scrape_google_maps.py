@@ -10,98 +10,482 @@ Usage:
     python scrape_google_maps.py --sample 100   # Sample of 100
     python scrape_google_maps.py --all          # Full dataset (use with caution)
     python scrape_google_maps.py --resume       # Resume from last progress
+    python scrape_google_maps.py --sample 100 --concurrency 4   # 4 searches at once
 """
 
 import asyncio
-import json
+import hashlib
 import random
 import re
 import argparse
+import sqlite3
 import time
 from pathlib import Path
 from datetime import datetime
-from difflib import SequenceMatcher
-from urllib.parse import quote_plus
+from functools import lru_cache
+from urllib.parse import quote_plus, urlsplit
 
+import orjson
 from playwright.async_api import async_playwright
 from playwright_stealth import Stealth
 
+from merge_google_data import similarity
+
 
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR.parent / "data"
 INPUT_FILE = DATA_DIR / "restaurants.json"
 OUTPUT_FILE = DATA_DIR / "google_maps_raw.json"
-PROGRESS_FILE = DATA_DIR / "scrape_progress.json"
+PROGRESS_FILE = DATA_DIR / "scrape_progress.jsonl"
+CACHE_FILE = DATA_DIR / "gmaps_cache.sqlite"
+SCRAPED_INDEX_FILE = DATA_DIR / "scrape_progress.db"
+LEGACY_PROGRESS_FILE = DATA_DIR / "scrape_progress.json"  # Single-JSON progress from older sessions
 
 
 # Rate limiting settings (conservative for no proxies)
-MIN_DELAY = 3.0  # Minimum seconds between requests
-MAX_DELAY = 6.0  # Maximum seconds between requests
+MIN_DELAY = 3.0  # Minimum starting seconds between requests
+MAX_DELAY = 6.0  # Maximum starting seconds between requests
 BATCH_SIZE = 50  # Requests before longer pause
 BATCH_PAUSE = 60  # Seconds to pause between batches
+DEFAULT_CONCURRENCY = 1  # Browser contexts scraping at once
+
+# Adaptive pacing: the delay starts between MIN_DELAY and MAX_DELAY, shrinks
+# while searches go through and doubles whenever Google pushes back
+FLOOR_DELAY = 0.5  # Fastest pace the delay can shrink to
+CEILING_DELAY = 60.0  # Slowest pace the delay can grow to
+BACKOFF_BASE = 10.0  # Seconds before the first retry of a throttled search
+MAX_ATTEMPTS = 5  # Tries per search before giving up on it
+THROTTLE_STATUSES = frozenset({429, 503})
+EXTRACT_TIMEOUT = 15.0  # Seconds allowed to read one result page (its waits take up to 13.5)
+CACHE_TTL = 30 * 24 * 3600  # Seconds a cached place lookup stays valid
+
+# Compiled once; these run for every element inspected on every page
+_WS_RE = re.compile(r'\s+')
+# Substrings that mark button/span text as a place category
+_CATEGORY_KEYWORD_RE = re.compile(r'restaurant|cafe|food|cuisine|bar|grill|kitchen|diner|pizzeria|bakery|deli')
+# Substrings that make an aria-label worth searching for a category
+_LABEL_KEYWORD_RE = re.compile(r'restaurant|cafe|cuisine')
+_LABEL_CATEGORY_RE = re.compile(r'([\w\s]+(?:restaurant|cafe|cuisine|food|bar|grill))', re.IGNORECASE)
+_RATING_RE = re.compile(r'([\d.]+)\s*star', re.IGNORECASE)
+_REVIEWS_LABEL_RE = re.compile(r'([\d,]+)\s*review', re.IGNORECASE)
+_REVIEWS_TEXT_RE = re.compile(r'\(?([\d,]+)\)?')
+
+# Only DOM text is read, so everything that just paints the page is dropped
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'media', 'stylesheet'})
+BLOCKED_DOMAINS = ('.googleadservices.com', '.doubleclick.net', '.google-analytics.com', '.googletagmanager.com')
 
 
 def load_restaurants():
     """Load preprocessed restaurant data."""
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = orjson.loads(INPUT_FILE.read_bytes())
     return data.get('restaurants', [])
 
 
-def load_progress():
-    """Load scraping progress if exists."""
-    if PROGRESS_FILE.exists():
-        with open(PROGRESS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {
-        'scraped_ids': [],
-        'results': [],
-        'failed': [],
-        'last_updated': None
-    }
+def restaurant_key(name, address):
+    """Fixed-size key identifying a restaurant in the scraped index."""
+    return hashlib.blake2b(f"{name}|{address}".encode('utf-8'), digest_size=16).digest()
 
 
-def save_progress(progress):
-    """Save scraping progress."""
-    progress['last_updated'] = datetime.now().isoformat()
-    with open(PROGRESS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(progress, f, indent=2)
+def result_key(result):
+    """restaurant_key() for the restaurant a result was scraped for."""
+    return restaurant_key(result['original_name'], result['original_address'])
 
 
-def save_results(results):
-    """Save final results."""
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump({
-            'scraped_at': datetime.now().isoformat(),
-            'count': len(results),
-            'results': results
-        }, f, indent=2)
+class ScrapedIndex:
+    """
+    sqlite set of restaurants already scraped.
+
+    Resuming checks membership here instead of parsing the whole progress
+    log into memory first.
+    """
+
+    def __init__(self, path, resume=False):
+        self._db = sqlite3.connect(path)
+        self._db.execute('CREATE TABLE IF NOT EXISTS scraped (id BLOB PRIMARY KEY)')
+        if not resume:
+            with self._db:
+                self._db.execute('DELETE FROM scraped')
+
+    def __contains__(self, key):
+        return self._db.execute('SELECT 1 FROM scraped WHERE id = ?', (key,)).fetchone() is not None
+
+    def __len__(self):
+        return self._db.execute('SELECT COUNT(*) FROM scraped').fetchone()[0]
 
+    def add(self, key):
+        with self._db:
+            self._db.execute('INSERT OR IGNORE INTO scraped VALUES (?)', (key,))
 
-def similarity(a, b):
-    """Calculate string similarity ratio."""
-    if not a or not b:
-        return 0
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+    def close(self):
+        self._db.close()
 
 
-def build_search_query(restaurant):
-    """Build Google Maps search query from restaurant data."""
-    name = restaurant.get('name', '')
-    address = restaurant.get('address', '')
-    boro = restaurant.get('boro', '')
+def load_logged_results():
+    """
+    Read every result in the progress log.
 
+    Returns:
+        List of results, one per restaurant (the latest if it was logged twice)
+    """
+    results = {}
+    if PROGRESS_FILE.exists():
+        with open(PROGRESS_FILE, 'rb') as f:
+            for line in f:
+                try:
+                    result = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # A line cut short by an interrupted run; that restaurant gets rescraped
+                    continue
+                results[result_key(result)] = result
+    return list(results.values())
+
+
+class ProgressLog:
+    """
+    Append-only JSONL log of scrape results, one line per restaurant.
+
+    Each result is written and flushed as soon as it arrives, so saving
+    progress costs one line instead of re-serializing everything so far.
+    """
+
+    def __init__(self, path, resume=False):
+        self._file = open(path, 'ab' if resume else 'wb')
+        # Finish a line cut short by an interrupted run so the next result starts clean
+        if self._file.tell():
+            with open(path, 'rb') as f:
+                f.seek(-1, 2)
+                if f.read(1) != b'\n':
+                    self._file.write(b'\n')
+
+    def write(self, result):
+        self._file.write(orjson.dumps(result) + b'\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def import_legacy_progress(index):
+    """
+    Carry an older session's scrape_progress.json over into the progress
+    log and scraped index, so it can still be resumed.
+
+    Returns:
+        Number of results imported
+    """
+    progress = orjson.loads(LEGACY_PROGRESS_FILE.read_bytes())
+    log = ProgressLog(PROGRESS_FILE)
+    imported = 0
+    # Every scraped restaurant ended up in exactly one of the two lists
+    for result in progress.get('results', []) + progress.get('failed', []):
+        log.write(result)
+        index.add(result_key(result))
+        imported += 1
+    log.close()
+    return imported
+
+
+async def write_progress(log, index, queue):
+    """
+    Drain results from a queue into the progress log and scraped index.
+
+    Runs as the only task touching either, so scrape tasks just enqueue a
+    result and carry on. Stops at a None sentinel.
+    """
+    while True:
+        result = await queue.get()
+        if result is None:
+            return
+        # Log first: a crash in between means a rescrape, never a lost result
+        log.write(result)
+        index.add(result_key(result))
+
+
+def save_results(results):
+    """Save final results."""
+    OUTPUT_FILE.write_bytes(orjson.dumps({
+        'scraped_at': datetime.now().isoformat(),
+        'count': len(results),
+        'results': results
+    }, option=orjson.OPT_INDENT_2))
+
+
+@lru_cache(maxsize=65536)
+def build_search_query(name, address, boro):
+    """
+    Build Google Maps search query from restaurant data.
+
+    Cached: chains repeat the same inputs, and each restaurant asks for its
+    query twice (cache lookup, then the search).
+    """
     # Clean up the name (remove extra spaces, special chars)
-    name = re.sub(r'\s+', ' ', name).strip()
+    name = _WS_RE.sub(' ', name).strip()
 
     # Build query: "Restaurant Name" address NYC
     query = f'"{name}" {address} {boro} NYC'
     return query
 
 
+def restaurant_query(restaurant):
+    """build_search_query() for a restaurant dict."""
+    return build_search_query(restaurant.get('name', ''), restaurant.get('address', ''), restaurant.get('boro', ''))
+
+
+@lru_cache(maxsize=65536)
+def _encode_url(query):
+    """Google Maps search URL for a query."""
+    return f'https://www.google.com/maps/search/{quote_plus(query)}'
+
+
+class ResultCache:
+    """
+    On-disk cache of place info keyed by the SHA-1 of the search query.
+
+    Lets a rerun (or an overlapping dataset) skip the browser for queries
+    that were already answered within the TTL.
+    """
+
+    def __init__(self, path, ttl=CACHE_TTL):
+        self.ttl = ttl
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS places '
+            '(key TEXT PRIMARY KEY, info TEXT NOT NULL, stored_at REAL NOT NULL)'
+        )
+
+    @staticmethod
+    def _key(query):
+        return hashlib.sha1(query.encode('utf-8')).hexdigest()
+
+    def get(self, query):
+        """Return cached place info for a query, or None if missing or expired."""
+        row = self._db.execute(
+            'SELECT info, stored_at FROM places WHERE key = ?', (self._key(query),)
+        ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return orjson.loads(row[0])
+
+    def set(self, query, info):
+        """Store place info for a query."""
+        with self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO places VALUES (?, ?, ?)',
+                (self._key(query), orjson.dumps(info), time.time())
+            )
+
+    def close(self):
+        self._db.close()
+
+
+class RateLimiter:
+    """
+    Delay between searches that adapts to how Google is responding.
+
+    Every clean search trims the delay by 10% down to FLOOR_DELAY; every
+    throttled one doubles it up to CEILING_DELAY. Shared by all slots.
+    """
+
+    def __init__(self):
+        self.delay = (MIN_DELAY + MAX_DELAY) / 2
+
+    def succeeded(self):
+        self.delay = max(FLOOR_DELAY, self.delay * 0.9)
+
+    def throttled(self):
+        self.delay = min(CEILING_DELAY, self.delay * 2)
+
+    async def wait(self):
+        """Sleep for the current delay, jittered by +/-25%."""
+        await asyncio.sleep(random.uniform(self.delay * 0.75, self.delay * 1.25))
+
+
+def is_throttled(page, response):
+    """True if a navigation hit a rate limit or Google's /sorry/ captcha page."""
+    if response is not None and response.status in THROTTLE_STATUSES:
+        return True
+    return '/sorry/' in page.url
+
+
+async def block_heavy_resources(route):
+    """Route handler that aborts images, fonts, media, CSS and ad/analytics hosts."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+        return
+    # Leading dot so a domain matches itself and its subdomains only
+    host = '.' + (urlsplit(request.url).hostname or '')
+    if host.endswith(BLOCKED_DOMAINS):
+        await route.abort()
+        return
+    await route.continue_()
+
+
+class BrowserPool:
+    """
+    One warm Chromium instance with a fixed set of stealth contexts.
+
+    Contexts are created once and handed out through a queue, so a scrape
+    only pays for opening a page. Use as an async context manager.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._playwright = None
+        self._browser = None
+        self._idle = asyncio.Queue()
+
+    async def __aenter__(self):
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(
+            headless=True,
+            args=[
+                '--disable-blink-features=AutomationControlled',
+                '--no-sandbox',
+                '--disable-dev-shm-usage',
+            ]
+        )
+
+        stealth = Stealth()
+        for _ in range(self.size):
+            context = await self._browser.new_context(
+                viewport={'width': 1920, 'height': 1080},
+                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                locale='en-US',
+                timezone_id='America/New_York'
+            )
+            # Stealth patches every page later opened in this context
+            await stealth.apply_stealth_async(context)
+            await context.route("**/*", block_heavy_resources)
+            self._idle.put_nowait(context)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._browser.close()
+        await self._playwright.stop()
+
+    async def get_context(self):
+        """Wait for an idle context and take it."""
+        return await self._idle.get()
+
+    def release(self, context):
+        """Return a context taken with get_context()."""
+        self._idle.put_nowait(context)
+
+
+# Pulls the raw text of every element extract_place_info looks at in one
+# page.evaluate() call; the selectors are the ones each method used to query.
+# Takes the category keyword pattern so the fallback lists (spans, then
+# aria-labels) are only gathered while no category has turned up.
+PLACE_FIELDS_JS = """
+(keywords) => {
+    const keywordRe = new RegExp(keywords);
+    const looksLikeCategory = (t) => Boolean(t) && t.length < 100 && keywordRe.test(t.toLowerCase());
+    const text = (el) => (el ? el.innerText : null);
+    const texts = (sel) => Array.from(document.querySelectorAll(sel), (el) => el.innerText);
+    const buttons = texts('button[jsaction*="pane.rating.category"], button.DkEaL');
+    const spans = buttons.some(looksLikeCategory) ? [] : texts('span.fontBodyMedium, span.DkEaL');
+    const labels = buttons.some(looksLikeCategory) || spans.some(looksLikeCategory) ? [] :
+        Array.from(document.querySelectorAll('[aria-label]'), (el) => el.getAttribute('aria-label')).slice(0, 50);
+    const rating = document.querySelector('[aria-label*="star"], span.ceNzKf, span.MW4etd');
+    const review = document.querySelector('[aria-label*="review"], span.UY7F9');
+    return {
+        name: text(document.querySelector('h1.fontHeadlineLarge, h1')),
+        buttons: buttons,
+        spans: spans,
+        labels: labels,
+        rating_label: rating && rating.getAttribute('aria-label'),
+        rating_text: text(rating),
+        review_label: review && review.getAttribute('aria-label'),
+        review_text: text(review),
+        address: text(document.querySelector('[data-item-id="address"], button[data-tooltip="Copy address"]')),
+    };
+}
+"""
+
+
+# True once the place name has rendered
+H1_READY_JS = "() => { const h1 = document.querySelector('h1'); return Boolean(h1 && h1.innerText.trim()); }"
+
+
+def parse_place_fields(fields, info):
+    """
+    Fill place info from the raw element text gathered by PLACE_FIELDS_JS.
+
+    Args:
+        fields: Dict returned by page.evaluate(PLACE_FIELDS_JS)
+        info: Place info dict to update in place
+    """
+    # Method 1: The place title/name (h1 is the main place name)
+    text = fields.get('name')
+    if text and len(text) < 200:  # Sanity check
+        info['google_name'] = text.strip()
+
+    # Method 2: Category button (Google shows category as clickable button)
+    # Method 3: Category in span elements near the header
+    # The category appears below the name, usually contains "restaurant", "cafe", etc.
+    for text in fields.get('buttons', []) + fields.get('spans', []):
+        if text and len(text) < 100 and _CATEGORY_KEYWORD_RE.search(text.lower()):
+            info['google_category'] = text.strip()
+            break
+
+    # Method 4: Check aria-labels for category info
+    if not info['google_category']:
+        for label in fields.get('labels', []):
+            if label and len(label) < 100:
+                # Look for patterns like "Mexican restaurant" in aria-labels
+                if _LABEL_KEYWORD_RE.search(label.lower()):
+                    # Extract the category part
+                    match = _LABEL_CATEGORY_RE.search(label)
+                    if match:
+                        info['google_category'] = match.group(1).strip()
+                        break
+
+    # Method 5: Rating (aria-label containing stars, else the element text)
+    label = fields.get('rating_label')
+    if label:
+        match = _RATING_RE.search(label)
+        if match:
+            try:
+                info['google_rating'] = float(match.group(1))
+            except ValueError:
+                pass
+    elif fields.get('rating_text'):
+        try:
+            rating = float(fields['rating_text'].strip())
+            if 1 <= rating <= 5:
+                info['google_rating'] = rating
+        except ValueError:
+            pass
+
+    # Method 6: Review count
+    label = fields.get('review_label')
+    text = fields.get('review_text')
+    match = None
+    if label:
+        match = _REVIEWS_LABEL_RE.search(label)
+    elif text:
+        # Often formatted as "(1,234)"
+        match = _REVIEWS_TEXT_RE.search(text)
+    if match:
+        try:
+            info['google_reviews'] = int(match.group(1).replace(',', ''))
+        except ValueError:
+            pass
+
+    # Method 7: Address
+    if fields.get('address'):
+        info['google_address'] = fields['address']
+
+
 async def extract_place_info(page):
-    """Extract place information from Google Maps result page."""
+    """
+    Extract place information from Google Maps result page.
+
+    Gives up after EXTRACT_TIMEOUT seconds so one stuck page can't hold a
+    slot; whatever was filled in by then is kept.
+    """
     info = {
         'found': False,
         'google_name': None,
@@ -113,129 +497,37 @@ async def extract_place_info(page):
     }
 
     try:
-        # Wait for the page to settle (don't use networkidle - Google Maps never stops)
-        await asyncio.sleep(3)  # Give time for initial render
+        await asyncio.wait_for(_fill_place_info(page, info), EXTRACT_TIMEOUT)
+    except asyncio.TimeoutError:
+        info['error'] = 'extraction timed out'
 
-        # Get current URL
-        info['google_url'] = page.url
+    return info
 
+
+async def _fill_place_info(page, info):
+    """Fill place info in place from the page (body of extract_place_info)."""
+    try:
+        # Wait for the page to settle (don't use networkidle - Google Maps never stops)
         # Wait for any of these common Google Maps elements
         try:
             await page.wait_for_selector('h1, [role="main"], .fontHeadlineLarge', timeout=8000)
         except:
             pass  # Continue even if timeout
 
-        await asyncio.sleep(1)  # Extra stabilization
-
-        # Method 1: Look for the place title/name (h1 is the main place name)
+        # Then for the place name itself to render (a results list has none)
         try:
-            name_el = await page.query_selector('h1.fontHeadlineLarge, h1')
-            if name_el:
-                text = await name_el.inner_text()
-                if text and len(text) < 200:  # Sanity check
-                    info['google_name'] = text.strip()
+            await page.wait_for_function(H1_READY_JS, timeout=5000)
         except:
             pass
 
-        # Method 2: Look for category button (Google shows category as clickable button)
-        # The category appears below the name, usually contains "restaurant", "cafe", etc.
-        try:
-            # Look for buttons in the header area that might be categories
-            buttons = await page.query_selector_all('button[jsaction*="pane.rating.category"], button.DkEaL')
-            for btn in buttons:
-                text = await btn.inner_text()
-                if text and len(text) < 100:
-                    # Check if it looks like a category
-                    text_lower = text.lower()
-                    if any(keyword in text_lower for keyword in ['restaurant', 'cafe', 'food', 'cuisine', 'bar', 'grill', 'kitchen', 'diner', 'pizzeria', 'bakery', 'deli']):
-                        info['google_category'] = text.strip()
-                        break
-        except:
-            pass
+        await asyncio.sleep(0.5)  # Extra stabilization
 
-        # Method 3: Look for category in span elements near the header
-        if not info['google_category']:
-            try:
-                # Category often appears as a span with specific class
-                spans = await page.query_selector_all('span.fontBodyMedium, span.DkEaL')
-                for span in spans:
-                    text = await span.inner_text()
-                    if text and len(text) < 100:
-                        text_lower = text.lower()
-                        if any(keyword in text_lower for keyword in ['restaurant', 'cafe', 'food', 'cuisine', 'bar', 'grill', 'kitchen', 'diner', 'pizzeria', 'bakery', 'deli']):
-                            info['google_category'] = text.strip()
-                            break
-            except:
-                pass
-
-        # Method 4: Check aria-labels for category info
-        if not info['google_category']:
-            try:
-                els = await page.query_selector_all('[aria-label]')
-                for el in els[:50]:  # Limit to first 50 to avoid too much processing
-                    label = await el.get_attribute('aria-label')
-                    if label and len(label) < 100:
-                        label_lower = label.lower()
-                        # Look for patterns like "Mexican restaurant" in aria-labels
-                        for keyword in ['restaurant', 'cafe', 'cuisine']:
-                            if keyword in label_lower:
-                                # Extract the category part
-                                match = re.search(r'([\w\s]+(?:restaurant|cafe|cuisine|food|bar|grill))', label, re.IGNORECASE)
-                                if match:
-                                    info['google_category'] = match.group(1).strip()
-                                    break
-                    if info['google_category']:
-                        break
-            except:
-                pass
-
-        # Method 5: Look for rating (aria-label containing stars)
-        try:
-            rating_el = await page.query_selector('[aria-label*="star"], span.ceNzKf, span.MW4etd')
-            if rating_el:
-                # Try aria-label first
-                label = await rating_el.get_attribute('aria-label')
-                if label:
-                    match = re.search(r'([\d.]+)\s*star', label, re.IGNORECASE)
-                    if match:
-                        info['google_rating'] = float(match.group(1))
-                else:
-                    # Try inner text
-                    text = await rating_el.inner_text()
-                    try:
-                        rating = float(text.strip())
-                        if 1 <= rating <= 5:
-                            info['google_rating'] = rating
-                    except:
-                        pass
-        except:
-            pass
-
-        # Method 6: Look for review count
-        try:
-            review_el = await page.query_selector('[aria-label*="review"], span.UY7F9')
-            if review_el:
-                label = await review_el.get_attribute('aria-label')
-                if label:
-                    match = re.search(r'([\d,]+)\s*review', label, re.IGNORECASE)
-                    if match:
-                        info['google_reviews'] = int(match.group(1).replace(',', ''))
-                else:
-                    text = await review_el.inner_text()
-                    # Often formatted as "(1,234)"
-                    match = re.search(r'\(?([\d,]+)\)?', text)
-                    if match:
-                        info['google_reviews'] = int(match.group(1).replace(',', ''))
-        except:
-            pass
+        # Get current URL (after any redirect to the place page)
+        info['google_url'] = page.url
 
-        # Method 7: Get address from the page
-        try:
-            address_el = await page.query_selector('[data-item-id="address"], button[data-tooltip="Copy address"]')
-            if address_el:
-                info['google_address'] = await address_el.inner_text()
-        except:
-            pass
+        # One round trip to the browser for every field, parsed below
+        fields = await page.evaluate(PLACE_FIELDS_JS, _CATEGORY_KEYWORD_RE.pattern)
+        parse_place_fields(fields, info)
 
         # Consider found if we have a name
         info['found'] = bool(info['google_name'])
@@ -243,17 +535,19 @@ async def extract_place_info(page):
     except Exception as e:
         info['error'] = str(e)
 
-    return info
-
 
-async def scrape_restaurant(page, restaurant, index, total):
-    """Scrape Google Maps for a single restaurant."""
-    query = build_search_query(restaurant)
-    search_url = f'https://www.google.com/maps/search/{quote_plus(query)}'
+def apply_match_confidence(result, restaurant, info):
+    """Copy place info into a result and score the name match."""
+    result.update(info)
+    if info['google_name']:
+        name_sim = similarity(restaurant['name'], info['google_name'])
+        result['name_similarity'] = round(name_sim, 2)
+        result['confident_match'] = name_sim > 0.7
 
-    print(f"[{index+1}/{total}] Searching: {restaurant['name'][:40]}...")
 
-    result = {
+def new_result(restaurant, query):
+    """Start a result dict carrying the original restaurant fields."""
+    return {
         'original_name': restaurant['name'],
         'original_address': restaurant['address'],
         'original_category': restaurant['category'],
@@ -262,19 +556,77 @@ async def scrape_restaurant(page, restaurant, index, total):
         'scraped_at': datetime.now().isoformat()
     }
 
+
+def cached_result(restaurant, cache):
+    """
+    Build a result from the cache without touching the browser.
+
+    Args:
+        restaurant: Restaurant dict from restaurants.json
+        cache: ResultCache to look the search query up in
+
+    Returns:
+        Result dict, or None on a cache miss
+    """
+    query = restaurant_query(restaurant)
+    info = cache.get(query)
+    if info is None:
+        return None
+
+    result = new_result(restaurant, query)
+    result['cached'] = True
+    apply_match_confidence(result, restaurant, info)
+    return result
+
+
+async def scrape_restaurant(page, restaurant, index, total, cache=None, limiter=None):
+    """
+    Scrape Google Maps for a single restaurant.
+
+    Args:
+        page: Playwright page to search with
+        restaurant: Restaurant dict from restaurants.json
+        index: Position in this run, for logging
+        total: Restaurants in this run, for logging
+        cache: Optional ResultCache that found places are stored in
+        limiter: Optional RateLimiter told whether Google throttled the search
+
+    Returns:
+        Result dict with the original fields and any place info found
+    """
+    query = restaurant_query(restaurant)
+    search_url = _encode_url(query)
+    result = new_result(restaurant, query)
+
+    print(f"[{index+1}/{total}] Searching: {restaurant['name'][:40]}...")
+
     try:
-        # Navigate to search
-        await page.goto(search_url, wait_until='domcontentloaded', timeout=30000)
+        # Navigate to search, backing off exponentially while throttled
+        for attempt in range(MAX_ATTEMPTS):
+            response = await page.goto(search_url, wait_until='domcontentloaded', timeout=30000)
+            if not is_throttled(page, response):
+                if limiter is not None:
+                    limiter.succeeded()
+                break
+
+            if limiter is not None:
+                limiter.throttled()
+            backoff = BACKOFF_BASE * 2 ** attempt + random.uniform(0, 1)
+            print(f"    -> Throttled (attempt {attempt+1}/{MAX_ATTEMPTS}), backing off {backoff:.0f}s")
+            await asyncio.sleep(backoff)
+        else:
+            result['error'] = 'throttled'
+            result['throttled'] = True
+            result['found'] = False
+            return result
 
         # Extract info
         info = await extract_place_info(page)
-        result.update(info)
+        apply_match_confidence(result, restaurant, info)
 
-        # Calculate match confidence
-        if info['google_name']:
-            name_sim = similarity(restaurant['name'], info['google_name'])
-            result['name_similarity'] = round(name_sim, 2)
-            result['confident_match'] = name_sim > 0.7
+        # Only found places are cached; a miss may just be a blocked page
+        if cache is not None and info.get('found'):
+            cache.set(query, info)
 
     except Exception as e:
         result['error'] = str(e)
@@ -283,7 +635,7 @@ async def scrape_restaurant(page, restaurant, index, total):
     return result
 
 
-async def run_scraper(sample_size=None, resume=False, prioritize_unspecified=True):
+async def run_scraper(sample_size=None, resume=False, prioritize_unspecified=True, concurrency=DEFAULT_CONCURRENCY):
     """Main scraper function."""
     print("=" * 60)
     print("Google Maps Restaurant Scraper")
@@ -294,26 +646,33 @@ async def run_scraper(sample_size=None, resume=False, prioritize_unspecified=Tru
     restaurants = load_restaurants()
     print(f"Total restaurants: {len(restaurants)}")
 
-    # Load progress if resuming
-    progress = load_progress() if resume else {
-        'scraped_ids': [],
-        'results': [],
-        'failed': [],
-        'last_updated': None
-    }
+    # Progress saved before the JSONL log only needs importing once
+    legacy = (resume and LEGACY_PROGRESS_FILE.exists()
+              and not PROGRESS_FILE.exists() and not SCRAPED_INDEX_FILE.exists())
 
-    if resume and progress['scraped_ids']:
-        print(f"Resuming from previous session: {len(progress['scraped_ids'])} already scraped")
+    # Restaurants scraped by earlier sessions (forgotten unless resuming)
+    index = ScrapedIndex(SCRAPED_INDEX_FILE, resume=resume)
 
-    # Filter out already scraped
-    scraped_set = set(progress['scraped_ids'])
-    remaining = [r for r in restaurants if f"{r['name']}|{r['address']}" not in scraped_set]
+    if legacy:
+        imported = import_legacy_progress(index)
+        print(f"Imported {imported} results from {LEGACY_PROGRESS_FILE.name}")
+
+    if resume and len(index):
+        print(f"Resuming from previous session: {len(index)} already scraped")
+
+    # Filter out already scraped and, if requested, put "Unspecified"
+    # categories first, in one pass over the restaurants
+    unspecified, specified = [], []
+    for r in restaurants:
+        if resume and restaurant_key(r['name'], r['address']) in index:
+            continue
+        if prioritize_unspecified and 'Unspecified' in r.get('category', ''):
+            unspecified.append(r)
+        else:
+            specified.append(r)
+    remaining = unspecified + specified
 
-    # Prioritize "Unspecified" categories if requested
     if prioritize_unspecified:
-        unspecified = [r for r in remaining if 'Unspecified' in r.get('category', '')]
-        specified = [r for r in remaining if 'Unspecified' not in r.get('category', '')]
-        remaining = unspecified + specified
         print(f"Prioritizing {len(unspecified)} 'Unspecified' category restaurants")
 
     # Apply sample size
@@ -324,81 +683,109 @@ async def run_scraper(sample_size=None, resume=False, prioritize_unspecified=Tru
 
     if not remaining:
         print("No restaurants to scrape!")
+        index.close()
         return
 
+    cache = ResultCache(CACHE_FILE)
+    log = ProgressLog(PROGRESS_FILE, resume=resume)
+    results_queue = asyncio.Queue()
+    limiter = RateLimiter()
+    writer = asyncio.create_task(write_progress(log, index, results_queue))
+
     # Start browser
     print("\nLaunching browser...")
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=True,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-            ]
-        )
+    async with BrowserPool(concurrency) as pool:
+        print(f"Browser ready. Starting scrape with {concurrency} context(s)...\n")
 
-        context = await browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            locale='en-US',
-            timezone_id='America/New_York'
-        )
+        total = len(remaining)
+        completed = 0
+        found = 0
+        throttled = 0
+        # Only browser searches count towards the batch pause; cache hits
+        # finish without ever reaching Google
+        searched = 0
+
+        def record(result):
+            nonlocal completed, found, throttled
+
+            if result.get('throttled'):
+                # Kept out of the progress log and the scraped index, so
+                # --resume tries it again once Google has calmed down
+                throttled += 1
+                print(f"    -> THROTTLED (left for --resume)")
+            else:
+                # Update progress
+                results_queue.put_nowait(result)
+
+                if result.get('found'):
+                    found += 1
+                    status = "FOUND" if result.get('confident_match') else "found (low confidence)"
+                    category = result.get('google_category', 'N/A')
+                    print(f"    -> {status}: {category}")
+                else:
+                    print(f"    -> NOT FOUND")
 
-        page = await context.new_page()
+            completed += 1
 
-        # Apply stealth
-        stealth = Stealth()
-        await stealth.apply_stealth_async(page)
+            if completed % 10 == 0:
+                print(f"\n--- Progress: {found} found, {completed - found} not found ---\n")
 
-        print("Browser ready. Starting scrape...\n")
+        async def scrape_one(i, restaurant):
+            nonlocal searched
 
-        # Scrape loop
-        total = len(remaining)
-        for i, restaurant in enumerate(remaining):
-            # Scrape
-            result = await scrape_restaurant(page, restaurant, i, total)
-
-            # Update progress
-            restaurant_id = f"{restaurant['name']}|{restaurant['address']}"
-            progress['scraped_ids'].append(restaurant_id)
-
-            if result.get('found'):
-                progress['results'].append(result)
-                status = "FOUND" if result.get('confident_match') else "found (low confidence)"
-                category = result.get('google_category', 'N/A')
-                print(f"    -> {status}: {category}")
-            else:
-                progress['failed'].append(result)
-                print(f"    -> NOT FOUND")
-
-            # Save progress periodically
-            if (i + 1) % 10 == 0:
-                save_progress(progress)
-                print(f"\n--- Progress saved: {len(progress['results'])} found, {len(progress['failed'])} not found ---\n")
-
-            # Rate limiting
-            if (i + 1) % BATCH_SIZE == 0:
-                print(f"\n--- Batch pause ({BATCH_PAUSE}s) to avoid rate limiting ---\n")
-                await asyncio.sleep(BATCH_PAUSE)
-            else:
-                delay = random.uniform(MIN_DELAY, MAX_DELAY)
-                await asyncio.sleep(delay)
+            # Cache hits never touch Google, so they skip the slot and the delay
+            result = cached_result(restaurant, cache)
+            if result is not None:
+                print(f"[{i+1}/{total}] Cached: {restaurant['name'][:40]}")
+                record(result)
+                return
+
+            # Holding a context is the concurrency slot
+            context = await pool.get_context()
+            try:
+                page = await context.new_page()
+                try:
+                    # Scrape
+                    result = await scrape_restaurant(page, restaurant, i, total, cache, limiter)
+                finally:
+                    await page.close()
+
+                record(result)
+                searched += 1
+
+                # Rate limiting (holds this slot, so each context keeps its own pace)
+                if searched % BATCH_SIZE == 0:
+                    print(f"\n--- Batch pause ({BATCH_PAUSE}s) to avoid rate limiting ---\n")
+                    await asyncio.sleep(BATCH_PAUSE)
+                else:
+                    await limiter.wait()
+            finally:
+                pool.release(context)
+
+        await asyncio.gather(*(scrape_one(i, restaurant) for i, restaurant in enumerate(remaining)))
 
-        await browser.close()
+    # Let the writer finish everything queued before closing the log
+    results_queue.put_nowait(None)
+    await writer
+    cache.close()
+    log.close()
+    index.close()
 
-    # Final save
-    save_progress(progress)
-    save_results(progress['results'])
+    # Final save, covering earlier sessions too when resuming
+    logged = load_logged_results()
+    results = [r for r in logged if r.get('found')]
+    save_results(results)
 
     # Summary
     print("\n" + "=" * 60)
     print("SCRAPE COMPLETE")
     print("=" * 60)
-    print(f"Total scraped: {len(progress['scraped_ids'])}")
-    print(f"Found: {len(progress['results'])}")
-    print(f"Not found: {len(progress['failed'])}")
-    print(f"Match rate: {len(progress['results']) / len(progress['scraped_ids']) * 100:.1f}%")
+    print(f"Total scraped: {len(logged)}")
+    print(f"Found: {len(results)}")
+    print(f"Not found: {len(logged) - len(results)}")
+    if throttled:
+        print(f"Throttled: {throttled} (not saved; run with --resume to retry)")
+    print(f"Match rate: {len(results) / max(1, len(logged)) * 100:.1f}%")
     print(f"\nResults saved to: {OUTPUT_FILE}")
     print(f"Progress saved to: {PROGRESS_FILE}")
 
@@ -409,6 +796,8 @@ def main():
     parser.add_argument('--all', action='store_true', help='Scrape all restaurants')
     parser.add_argument('--resume', action='store_true', help='Resume from last progress')
     parser.add_argument('--no-prioritize', action='store_true', help='Do not prioritize Unspecified categories')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Searches to run at once (default: {DEFAULT_CONCURRENCY})')
 
     args = parser.parse_args()
 
@@ -425,7 +814,8 @@ def main():
     asyncio.run(run_scraper(
         sample_size=sample_size,
         resume=args.resume,
-        prioritize_unspecified=not args.no_prioritize
+        prioritize_unspecified=not args.no_prioritize,
+        concurrency=max(1, args.concurrency)
     ))
 
 
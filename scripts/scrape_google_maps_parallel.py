@@ -5,7 +5,7 @@ Google Maps Parallel Scraper for NYC Restaurant Cuisine Enrichment
 Optimized version with:
 - Multiple parallel browser contexts (5 workers by default)
 - Disabled images/CSS for faster page loads
-- Reduced delays
+- Token bucket rate limiting that backs off when Google blocks
 - Progress tracking with ETA
 
 Usage:
@@ -15,33 +15,109 @@ Usage:
 """
 
 import asyncio
-import json
-import random
+import hashlib
 import re
 import argparse
+import os
+import threading
 import time
 from pathlib import Path
 from datetime import datetime, timedelta
-from difflib import SequenceMatcher
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlencode
+from urllib.request import Request, urlopen
 from collections import deque
 
+import orjson
 from playwright.async_api import async_playwright
 from playwright_stealth import Stealth
 
+from merge_google_data import similarity, address_similarity
+
 
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR.parent / "data"
 INPUT_FILE = DATA_DIR / "restaurants.json"
 OUTPUT_FILE = DATA_DIR / "google_maps_raw.json"
-PROGRESS_FILE = DATA_DIR / "scrape_progress_parallel.json"
+PROGRESS_FILE = DATA_DIR / "scrape_progress_parallel.jsonl"
+LEGACY_PROGRESS_FILE = DATA_DIR / "scrape_progress_parallel.json"  # Single-JSON progress from older sessions
 
 
-# Optimized rate limiting settings
-MIN_DELAY = 1.5  # Reduced from 3.0
-MAX_DELAY = 2.5  # Reduced from 6.0
+# Rate limiting settings: a token bucket shared by all workers
+REQUESTS_PER_SEC = 2.0  # Starting sustained search rate
+BURST = 10  # Searches that may go back to back before the rate applies
+MIN_REQUESTS_PER_SEC = 0.1  # Floor the rate is never halved below
+BLOCK_COOLDOWN = 60  # Seconds a worker rests after Google blocks a search
+MAX_ATTEMPTS = 3  # Tries per restaurant while Google keeps blocking
+SECONDS_PER_PAGE = 3  # Rough page load + extraction time, for the estimate
 DEFAULT_WORKERS = 5  # Parallel browser contexts
+RECYCLE_AFTER = 200  # Pages a context serves before it is replaced
+LANDING_TIMEOUT = 2000  # ms for a search to show a place or a results list before it counts as a miss
+HEADER_TIMEOUT = 5000  # ms for a place's h1 to render once we know we're on it
+WARMUP_URL = 'https://www.google.com/generate_204'  # Empty response, just opens the connection
+
+# Optional OpenStreetMap lookup tried before the browser (--nominatim)
+NOMINATIM_URL = 'https://nominatim.openstreetmap.org/search'
+NOMINATIM_USER_AGENT = 'nyc-cuisine-map/1.0 (restaurant cuisine enrichment)'
+NOMINATIM_REQUESTS_PER_SEC = 1.0  # Nominatim usage policy: at most one request a second
+NOMINATIM_AMENITIES = frozenset({'restaurant', 'cafe', 'fast_food'})
+
+# Category keywords as a regex alternation, shared with PLACE_FIELDS_JS
+CATEGORY_KEYWORDS_PATTERN = 'restaurant|cafe|food|cuisine|bar|grill|kitchen|diner|pizzeria|bakery|deli'
+
+# Compiled once; these run for every element inspected on every page
+_WS_RE = re.compile(r'\s+')
+_ICON_RE = re.compile(r'[\ue000-\uf8ff]')  # Google Maps icons (private use area)
+_NL_RE = re.compile(r'\n+')
+_DBLCOMMA_RE = re.compile(r',\s*,')
+_NYC_ADDR_RE = re.compile(r'\d+.*(?:NY|New York|Manhattan|Brooklyn|Queens|Bronx|Staten)', re.IGNORECASE)
+_ADDR_NOISE_RE = re.compile(r'hour|open|close|review|rating')  # Hours/reviews text that also has numbers
+_CATEGORY_KEYWORD_RE = re.compile(CATEGORY_KEYWORDS_PATTERN)
+_LABEL_KEYWORD_RE = re.compile(r'restaurant|cafe|cuisine')
+_CAT_RE = re.compile(r'([\w\s]+(?:restaurant|cafe|cuisine|food|bar|grill))', re.IGNORECASE)
+_PLACE_URL_RE = re.compile(r'/maps/place/')  # Where Google redirects a search with one clear match
+
+# Resource types that only paint the page; the scraper reads DOM text
+BLOCKED_RESOURCE_TYPES = frozenset({'stylesheet', 'font', 'image', 'media', 'manifest'})
+
+
+class TokenBucket:
+    """
+    Token bucket limiting searches across all workers.
+
+    Holds up to `capacity` tokens, refilled at `rate` per second; each
+    search takes one. Halving the rate is how workers back off when
+    Google starts blocking, and every clean search wins back 10% up to the
+    starting rate, so one burst of blocks doesn't slow the rest of the run.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.max_rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and take it (waiters are served in order)."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def slow_down(self):
+        """Halve the refill rate, down to MIN_REQUESTS_PER_SEC."""
+        self.rate = max(MIN_REQUESTS_PER_SEC, self.rate / 2)
+
+    def speed_up(self):
+        """Raise the refill rate by 10%, up to the rate the bucket started at."""
+        self.rate = min(self.max_rate, self.rate * 1.1)
 
 
 class ProgressTracker:
@@ -52,8 +128,11 @@ class ProgressTracker:
         self.completed = 0
         self.found = 0
         self.failed = 0
+        self.blocked = 0  # Gave up on while Google kept blocking; not saved
         self.start_time = time.time()
         self.recent_times = deque(maxlen=50)  # Last 50 request times
+        self._recent_sum = 0.0  # Running sum of recent_times
+        self._last_print = 0.0
 
     def update(self, found=True, duration=0):
         self.completed += 1
@@ -61,13 +140,16 @@ class ProgressTracker:
             self.found += 1
         else:
             self.failed += 1
+        if len(self.recent_times) == self.recent_times.maxlen:
+            self._recent_sum -= self.recent_times[0]
         self.recent_times.append(duration)
+        self._recent_sum += duration
 
     def get_eta(self):
         if not self.recent_times or self.completed == 0:
             return "calculating..."
 
-        avg_time = sum(self.recent_times) / len(self.recent_times)
+        avg_time = self._recent_sum / len(self.recent_times)
         remaining = self.total - self.completed
         eta_seconds = remaining * avg_time
 
@@ -83,9 +165,15 @@ class ProgressTracker:
     def get_rate(self):
         if not self.recent_times:
             return 0
-        return 60 / (sum(self.recent_times) / len(self.recent_times))  # requests/min
+        return 60 / (self._recent_sum / len(self.recent_times))  # requests/min
 
     def print_status(self):
+        # At most once a second, but always for the last completion
+        now = time.monotonic()
+        if now - self._last_print < 1.0 and self.completed != self.total:
+            return
+        self._last_print = now
+
         elapsed = time.time() - self.start_time
         elapsed_str = str(timedelta(seconds=int(elapsed)))
         rate = self.get_rate()
@@ -99,46 +187,89 @@ class ProgressTracker:
 
 def load_restaurants():
     """Load preprocessed restaurant data."""
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = orjson.loads(INPUT_FILE.read_bytes())
     return data.get('restaurants', [])
 
 
-def load_progress():
-    """Load scraping progress if exists."""
-    if PROGRESS_FILE.exists():
-        with open(PROGRESS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+def restaurant_key(name, address):
+    """Compact 8-byte id for a restaurant, used in the scraped set."""
+    return hashlib.blake2b(f"{name}|{address}".encode('utf-8'), digest_size=8).digest()
+
+
+def new_progress():
+    """Empty progress, as kept in memory while scraping."""
     return {
-        'scraped_ids': [],
+        'scraped_ids': set(),
         'results': [],
-        'failed': [],
-        'last_updated': None
+        'failed': []
     }
 
 
-def save_progress(progress):
-    """Save scraping progress."""
-    progress['last_updated'] = datetime.now().isoformat()
-    with open(PROGRESS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(progress, f)
+def import_legacy_progress():
+    """Rewrite an older session's scrape_progress_parallel.json as the progress log."""
+    legacy = orjson.loads(LEGACY_PROGRESS_FILE.read_bytes())
+    # Every scraped restaurant ended up in exactly one of the two lists
+    results = legacy.get('results', []) + legacy.get('failed', [])
+    PROGRESS_FILE.write_bytes(b''.join(orjson.dumps(result) + b'\n' for result in results))
+    print(f"Imported {len(results)} results from {LEGACY_PROGRESS_FILE.name}")
 
 
-def save_results(results):
-    """Save final results."""
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump({
-            'scraped_at': datetime.now().isoformat(),
-            'count': len(results),
-            'results': results
-        }, f, indent=2)
+def load_progress():
+    """Rebuild scraping progress from the progress log if it exists."""
+    progress = new_progress()
+    # Progress saved before the JSONL log only needs importing once
+    if not PROGRESS_FILE.exists() and LEGACY_PROGRESS_FILE.exists():
+        import_legacy_progress()
+    if PROGRESS_FILE.exists():
+        with open(PROGRESS_FILE, 'rb') as f:
+            for line in f:
+                try:
+                    result = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # A line cut short by an interrupted run; that restaurant gets rescraped
+                    continue
+                progress['scraped_ids'].add(restaurant_key(result['original_name'], result['original_address']))
+                if result.get('found'):
+                    progress['results'].append(result)
+                else:
+                    progress['failed'].append(result)
+    return progress
+
+
+# Serializes appends from the executor threads so lines never interleave
+_progress_file_lock = threading.Lock()
+
+
+def start_progress_log(resume):
+    """Start a fresh progress log, or make sure a resumed one ends on a full line."""
+    if not resume or not PROGRESS_FILE.exists():
+        PROGRESS_FILE.write_bytes(b'')
+        return
+    with open(PROGRESS_FILE, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+
 
+def append_progress(result):
+    """Append one result to the progress log (JSONL, one line per restaurant)."""
+    line = orjson.dumps(result) + b'\n'
+    with _progress_file_lock:
+        with open(PROGRESS_FILE, 'ab') as f:
+            f.write(line)
 
-def similarity(a, b):
-    """Calculate string similarity ratio."""
-    if not a or not b:
-        return 0
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+
+def save_results(results):
+    """Save final results (written to a temp file, then swapped in)."""
+    tmp_file = OUTPUT_FILE.with_name(OUTPUT_FILE.name + '.tmp')
+    tmp_file.write_bytes(orjson.dumps({
+        'scraped_at': datetime.now().isoformat(),
+        'count': len(results),
+        'results': results
+    }, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_file, OUTPUT_FILE)
 
 
 def build_search_query(restaurant):
@@ -146,7 +277,7 @@ def build_search_query(restaurant):
     name = restaurant.get('name', '')
     address = restaurant.get('address', '')
     boro = restaurant.get('boro', '')
-    name = re.sub(r'\s+', ' ', name).strip()
+    name = _WS_RE.sub(' ', name).strip()
     query = f'"{name}" {address} {boro} NYC'
     return query
 
@@ -156,16 +287,123 @@ def clean_address(text):
     if not text:
         return None
     # Remove Google Maps icon characters (private use area unicode)
-    text = re.sub(r'[\ue000-\uf8ff]', '', text)
+    text = _ICON_RE.sub('', text)
     # Replace newlines with comma+space
-    text = re.sub(r'\n+', ', ', text)
+    text = _NL_RE.sub(', ', text)
     # Clean up multiple spaces/commas
-    text = re.sub(r',\s*,', ',', text)
-    text = re.sub(r'\s+', ' ', text)
+    text = _DBLCOMMA_RE.sub(',', text)
+    text = _WS_RE.sub(' ', text)
     text = text.strip(' ,')
     return text if text else None
 
 
+# Pulls the raw text of every element the extraction strategies look at in
+# one page.evaluate() call. The span and aria-label fallbacks are only
+# gathered while no category button/span has matched the keywords.
+PLACE_FIELDS_JS = """
+(keywords) => {
+    const keywordRe = new RegExp(keywords);
+    const looksLikeCategory = (t) => Boolean(t) && t.length < 100 && keywordRe.test(t.toLowerCase());
+    const text = (el) => (el ? el.innerText : null);
+    const texts = (sel, limit) => Array.from(document.querySelectorAll(sel), (el) => el.innerText).slice(0, limit);
+    const addressLabel = document.querySelector('[aria-label^="Address:"]');
+    const buttons = texts('button[jsaction*="pane.rating.category"], button.DkEaL');
+    const spans = buttons.some(looksLikeCategory) ? [] : texts('span.fontBodyMedium, span.DkEaL');
+    const labels = buttons.some(looksLikeCategory) || spans.some(looksLikeCategory) ? [] :
+        Array.from(document.querySelectorAll('[aria-label]'), (el) => el.getAttribute('aria-label')).slice(0, 30);
+    return {
+        name: text(document.querySelector('h1.fontHeadlineLarge, h1')),
+        address_button: text(document.querySelector('button[data-item-id="address"]')),
+        address_label: addressLabel && addressLabel.getAttribute('aria-label'),
+        address_candidates: texts('[data-item-id], button.CsEnBe', 20),
+        buttons: buttons,
+        spans: spans,
+        labels: labels,
+    };
+}
+"""
+
+
+def parse_place_fields(fields, info):
+    """
+    Fill place info from the raw element text gathered by PLACE_FIELDS_JS.
+
+    Args:
+        fields: Dict returned by page.evaluate(PLACE_FIELDS_JS, ...)
+        info: Place info dict to update in place
+    """
+    # Get name
+    text = fields.get('name')
+    if text and len(text) < 200:
+        info['google_name'] = text.strip()
+
+    # Get address - multiple strategies
+    # Strategy 1: Button with data-item-id="address"
+    text = fields.get('address_button')
+    if text and len(text) < 200:
+        info['google_address'] = clean_address(text)
+
+    # Strategy 2: Aria-label containing "Address:"
+    if not info['google_address']:
+        label = fields.get('address_label')
+        if label:
+            # Extract address after "Address: "
+            addr = label.replace('Address:', '').strip()
+            if addr and len(addr) < 200:
+                info['google_address'] = clean_address(addr)
+
+    # Strategy 3: Look for NYC address pattern in text content
+    if not info['google_address']:
+        for text in fields.get('address_candidates', []):
+            if text:
+                # Look for NYC address pattern (number + street + NY/NYC/borough)
+                if _NYC_ADDR_RE.search(text):
+                    if len(text) < 200 and not _ADDR_NOISE_RE.search(text.lower()):
+                        info['google_address'] = clean_address(text)
+                        break
+
+    # Get category from buttons, then spans
+    for text in fields.get('buttons', []) + fields.get('spans', []):
+        if text and len(text) < 100:
+            if _CATEGORY_KEYWORD_RE.search(text.lower()):
+                info['google_category'] = text.strip()
+                break
+
+    # Get category from aria-labels (limited search)
+    if not info['google_category']:
+        for label in fields.get('labels', []):
+            if label and len(label) < 100:
+                if _LABEL_KEYWORD_RE.search(label.lower()):
+                    match = _CAT_RE.search(label)
+                    if match:
+                        info['google_category'] = match.group(1).strip()
+                        break
+
+
+async def wait_for_landing(page):
+    """
+    Wait until the search has settled on a place or a results list.
+
+    goto() only waits for the response to commit, so this races the
+    redirect to a /maps/place/ URL against the header or feed rendering.
+
+    Returns:
+        True once either shows up, False if neither did in time
+    """
+    pending = {
+        asyncio.create_task(page.wait_for_url(_PLACE_URL_RE, timeout=LANDING_TIMEOUT)),
+        asyncio.create_task(page.wait_for_selector('h1, [role="feed"]', timeout=LANDING_TIMEOUT)),
+    }
+    landed = False
+    while pending and not landed:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        # A list, not a generator: every finished task's exception gets retrieved
+        landed = any([task.exception() is None for task in done])
+    for task in pending:
+        task.cancel()
+    return landed
+
+
 async def extract_place_info(page):
     """Extract place information from Google Maps result page."""
     info = {
@@ -177,114 +415,29 @@ async def extract_place_info(page):
     }
 
     try:
-        # Reduced wait time
-        await asyncio.sleep(1.5)
-        info['google_url'] = page.url
-
-        # Wait for main elements
-        try:
-            await page.wait_for_selector('h1, [role="main"]', timeout=5000)
-        except:
-            pass
+        # A place page has an h1; an ambiguous search shows a results feed
+        if not await wait_for_landing(page):
+            info['google_url'] = page.url
+            return info
+
+        # Disambiguation list: open the top result, or give up if it has none
+        if await page.query_selector('[role="feed"]'):
+            first = await page.query_selector('[role="feed"] a.hfpxzc')
+            if first is None:
+                info['google_url'] = page.url
+                return info
+            await first.click()
+            await page.wait_for_selector('h1', timeout=HEADER_TIMEOUT)
+        else:
+            # The /maps/place/ redirect can win the race before the header renders
+            await page.wait_for_selector('h1', timeout=HEADER_TIMEOUT)
 
+        info['google_url'] = page.url
         await asyncio.sleep(0.5)
 
-        # Get name
-        try:
-            name_el = await page.query_selector('h1.fontHeadlineLarge, h1')
-            if name_el:
-                text = await name_el.inner_text()
-                if text and len(text) < 200:
-                    info['google_name'] = text.strip()
-        except:
-            pass
-
-        # Get address - multiple strategies
-        # Strategy 1: Button with data-item-id="address"
-        try:
-            addr_btn = await page.query_selector('button[data-item-id="address"]')
-            if addr_btn:
-                text = await addr_btn.inner_text()
-                if text and len(text) < 200:
-                    info['google_address'] = clean_address(text)
-        except:
-            pass
-
-        # Strategy 2: Aria-label containing "Address:"
-        if not info['google_address']:
-            try:
-                addr_el = await page.query_selector('[aria-label^="Address:"]')
-                if addr_el:
-                    label = await addr_el.get_attribute('aria-label')
-                    if label:
-                        # Extract address after "Address: "
-                        addr = label.replace('Address:', '').strip()
-                        if addr and len(addr) < 200:
-                            info['google_address'] = clean_address(addr)
-            except:
-                pass
-
-        # Strategy 3: Look for NYC address pattern in text content
-        if not info['google_address']:
-            try:
-                # Look for elements containing NY address patterns
-                all_text = await page.query_selector_all('[data-item-id], button.CsEnBe')
-                for el in all_text[:20]:
-                    text = await el.inner_text()
-                    if text:
-                        # Look for NYC address pattern (number + street + NY/NYC/borough)
-                        if re.search(r'\d+.*(?:NY|New York|Manhattan|Brooklyn|Queens|Bronx|Staten)', text, re.IGNORECASE):
-                            if len(text) < 200 and not any(kw in text.lower() for kw in ['hour', 'open', 'close', 'review', 'rating']):
-                                info['google_address'] = clean_address(text)
-                                break
-            except:
-                pass
-
-        # Get category from buttons
-        try:
-            buttons = await page.query_selector_all('button[jsaction*="pane.rating.category"], button.DkEaL')
-            for btn in buttons:
-                text = await btn.inner_text()
-                if text and len(text) < 100:
-                    text_lower = text.lower()
-                    if any(kw in text_lower for kw in ['restaurant', 'cafe', 'food', 'cuisine', 'bar', 'grill', 'kitchen', 'diner', 'pizzeria', 'bakery', 'deli']):
-                        info['google_category'] = text.strip()
-                        break
-        except:
-            pass
-
-        # Get category from spans
-        if not info['google_category']:
-            try:
-                spans = await page.query_selector_all('span.fontBodyMedium, span.DkEaL')
-                for span in spans:
-                    text = await span.inner_text()
-                    if text and len(text) < 100:
-                        text_lower = text.lower()
-                        if any(kw in text_lower for kw in ['restaurant', 'cafe', 'food', 'cuisine', 'bar', 'grill', 'kitchen', 'diner', 'pizzeria', 'bakery', 'deli']):
-                            info['google_category'] = text.strip()
-                            break
-            except:
-                pass
-
-        # Get category from aria-labels (limited search)
-        if not info['google_category']:
-            try:
-                els = await page.query_selector_all('[aria-label]')
-                for el in els[:30]:
-                    label = await el.get_attribute('aria-label')
-                    if label and len(label) < 100:
-                        label_lower = label.lower()
-                        for keyword in ['restaurant', 'cafe', 'cuisine']:
-                            if keyword in label_lower:
-                                match = re.search(r'([\w\s]+(?:restaurant|cafe|cuisine|food|bar|grill))', label, re.IGNORECASE)
-                                if match:
-                                    info['google_category'] = match.group(1).strip()
-                                    break
-                    if info['google_category']:
-                        break
-            except:
-                pass
+        # One round trip to the browser for every field, parsed below
+        fields = await page.evaluate(PLACE_FIELDS_JS, CATEGORY_KEYWORDS_PATTERN)
+        parse_place_fields(fields, info)
 
         info['found'] = bool(info['google_name'])
 
@@ -294,12 +447,9 @@ async def extract_place_info(page):
     return info
 
 
-async def scrape_restaurant(page, restaurant):
-    """Scrape Google Maps for a single restaurant."""
-    query = build_search_query(restaurant)
-    search_url = f'https://www.google.com/maps/search/{quote_plus(query)}'
-
-    result = {
+def new_result(restaurant, query):
+    """Start a result dict carrying the original restaurant fields."""
+    return {
         'original_name': restaurant['name'],
         'original_address': restaurant['address'],
         'original_category': restaurant['category'],
@@ -308,8 +458,24 @@ async def scrape_restaurant(page, restaurant):
         'scraped_at': datetime.now().isoformat()
     }
 
+
+async def scrape_restaurant(page, restaurant):
+    """Scrape Google Maps for a single restaurant."""
+    query = build_search_query(restaurant)
+    search_url = f'https://www.google.com/maps/search/{quote_plus(query)}'
+
+    result = new_result(restaurant, query)
+
     try:
-        await page.goto(search_url, wait_until='domcontentloaded', timeout=15000)
+        response = await page.goto(search_url, wait_until='commit', timeout=15000)
+
+        # Rate limited, or sent to the /sorry/ captcha page
+        if (response is not None and response.status == 429) or '/sorry/' in page.url:
+            result['error'] = 'blocked by Google'
+            result['blocked'] = True
+            result['found'] = False
+            return result
+
         info = await extract_place_info(page)
         result.update(info)
 
@@ -333,72 +499,241 @@ async def scrape_restaurant(page, restaurant):
     return result
 
 
-async def worker(worker_id, queue, progress, progress_lock, results_lock, progress_data):
-    """Worker that processes restaurants from the queue."""
-    async with async_playwright() as p:
-        # Launch browser with optimizations
-        browser = await p.chromium.launch(
-            headless=True,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-gpu',
-            ]
-        )
+def fetch_nominatim(query):
+    """
+    Search Nominatim for OSM places matching a query.
 
+    Returns:
+        List of jsonv2 place dicts, empty if the request failed
+    """
+    params = urlencode({'format': 'jsonv2', 'q': query, 'addressdetails': 1, 'extratags': 1, 'limit': 5})
+    request = Request(f'{NOMINATIM_URL}?{params}', headers={'User-Agent': NOMINATIM_USER_AGENT})
+    try:
+        with urlopen(request, timeout=10) as response:
+            return orjson.loads(response.read())
+    except Exception:
+        return []
+
+
+def nominatim_match(restaurant, places):
+    """
+    Pick the OSM place that is clearly this restaurant and carries a cuisine.
+
+    The cuisine tag ('mexican', 'pizza;italian') becomes a Google-style
+    "Mexican restaurant" category so map_google_category() handles it.
+
+    Returns:
+        Fields to merge into the result, or None if no place qualifies
+    """
+    for place in places:
+        # Nominatim sends null rather than {} for places without these
+        cuisine = (place.get('extratags') or {}).get('cuisine')
+        if not cuisine or place.get('category') != 'amenity' or place.get('type') not in NOMINATIM_AMENITIES:
+            continue
+
+        address = place.get('address') or {}
+        street = ' '.join(filter(None, (address.get('house_number'), address.get('road'))))
+        name_sim = similarity(restaurant['name'], place.get('name'))
+        addr_sim = address_similarity(restaurant['address'], street)
+
+        # Stricter than a Google hit: both name and address have to agree
+        if name_sim > 0.8 and addr_sim > 0.8:
+            cuisine = cuisine.split(';')[0].replace('_', ' ')
+            return {
+                'found': True,
+                'source': 'nominatim',
+                'google_name': place.get('name'),
+                'google_address': place.get('display_name'),
+                'google_category': f'{cuisine.title()} restaurant',
+                'google_url': f"https://www.openstreetmap.org/{place.get('osm_type')}/{place.get('osm_id')}",
+                'name_similarity': round(name_sim, 2),
+                'address_similarity': round(addr_sim, 2),
+                'confident_match': True,
+            }
+    return None
+
+
+async def try_http_lookup(restaurant, bucket):
+    """
+    Resolve a restaurant through Nominatim instead of a browser page.
+
+    Args:
+        restaurant: Restaurant dict
+        bucket: TokenBucket holding Nominatim to its rate limit
+
+    Returns:
+        Result dict shaped like scrape_restaurant()'s, or None on a miss
+    """
+    query = f"{restaurant['name']}, {restaurant['address']}, {restaurant['boro']}, New York"
+    await bucket.acquire()
+    places = await asyncio.get_running_loop().run_in_executor(None, fetch_nominatim, query)
+    try:
+        match = nominatim_match(restaurant, places)
+    except Exception:
+        # A response in an unexpected shape counts as a miss; Playwright tries next
+        match = None
+    if match is None:
+        return None
+
+    result = new_result(restaurant, query)
+    result.update(match)
+    return result
+
+
+async def block_resources(route):
+    """Route handler that aborts BLOCKED_RESOURCE_TYPES and lets the rest through."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class ContextPool:
+    """
+    Browser contexts on the shared browser, handed out through a queue.
+
+    Google Maps keeps piling up DOM and JS heap in a context, so each one is
+    closed and replaced after serving RECYCLE_AFTER pages.
+    """
+
+    def __init__(self, browser, size):
+        self.browser = browser
+        self.size = size
+        self._idle = asyncio.Queue()
+        self._uses = {}
+        self._stealth = Stealth()
+
+    async def start(self):
+        for _ in range(self.size):
+            self._idle.put_nowait(await self._new_context())
+
+    async def _new_context(self):
         # Create context with resource blocking
-        context = await browser.new_context(
+        context = await self.browser.new_context(
             viewport={'width': 1280, 'height': 720},
             user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             locale='en-US',
             timezone_id='America/New_York'
         )
 
+        # Stealth is an init script, so installing it on the context covers
+        # every page opened later without reinjecting it per page
+        await self._stealth.apply_stealth_async(context)
+
         # Block images, fonts, stylesheets for faster loading
-        await context.route("**/*.{png,jpg,jpeg,gif,svg,ico,woff,woff2,ttf}", lambda route: route.abort())
-        await context.route("**/*", lambda route: route.abort() if route.request.resource_type in ["stylesheet", "font", "image"] else route.continue_())
+        await context.route("**/*", block_resources)
 
+        # Each context has its own connection pool; open the connection to
+        # Google now rather than on the first search
         page = await context.new_page()
-
-        # Apply stealth
-        stealth = Stealth()
-        await stealth.apply_stealth_async(page)
-
-        while True:
+        try:
+            await page.goto(WARMUP_URL, wait_until='commit', timeout=5000)
+        except Exception:
+            pass  # The first search just pays for the handshake instead
+        finally:
+            await page.close()
+
+        self._uses[context] = 0
+        return context
+
+    async def acquire(self):
+        """Wait for an idle context and take it."""
+        return await self._idle.get()
+
+    async def release(self, context, broken=False):
+        """
+        Return a context after one page.
+
+        It is replaced instead if it is worn out, or if the caller found it
+        broken (it could no longer open pages), so no worker gets it again.
+        """
+        self._uses[context] += 1
+        if broken or self._uses[context] >= RECYCLE_AFTER:
+            del self._uses[context]
             try:
-                restaurant = queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
-
-            start_time = time.time()
-
-            # Scrape
-            result = await scrape_restaurant(page, restaurant)
-            duration = time.time() - start_time
-
-            # Update progress
-            restaurant_id = f"{restaurant['name']}|{restaurant['address']}"
-
-            async with progress_lock:
-                progress_data['scraped_ids'].append(restaurant_id)
-                if result.get('found'):
-                    progress_data['results'].append(result)
+                await context.close()
+            except Exception:
+                pass  # A crashed context may already be gone
+            context = await self._new_context()
+        self._idle.put_nowait(context)
+
+    async def close(self):
+        for context in list(self._uses):
+            await context.close()
+
+
+async def worker(worker_id, pool, bucket, restaurants, progress, progress_data, http_bucket=None):
+    """
+    Worker that scrapes restaurants, one fresh page per restaurant.
+
+    Every worker pulls from the same iterator; next() never awaits, so no
+    two workers get the same restaurant and whoever is free takes the next.
+    With an http_bucket, Nominatim is asked first and only misses load a page.
+    """
+    for restaurant in restaurants:
+        start_time = time.time()
+
+        result = None
+        if http_bucket is not None:
+            result = await try_http_lookup(restaurant, http_bucket)
+
+        if result is None:
+            for attempt in range(MAX_ATTEMPTS):
+                await bucket.acquire()
+                context = await pool.acquire()
+                broken = False
+                try:
+                    page = await context.new_page()
+                except Exception as e:
+                    # The context has crashed; fail this restaurant and let
+                    # the pool swap in a fresh context
+                    broken = True
+                    result = new_result(restaurant, build_search_query(restaurant))
+                    result['error'] = str(e)
+                    result['found'] = False
                 else:
-                    progress_data['failed'].append(result)
-
-            async with results_lock:
-                progress.update(found=result.get('found', False), duration=duration)
-                progress.print_status()
+                    try:
+                        result = await scrape_restaurant(page, restaurant)
+                    finally:
+                        await page.close()
+                finally:
+                    await pool.release(context, broken)
+
+                if not result.get('blocked'):
+                    bucket.speed_up()
+                    break
+
+                # Back off: slower for everyone, and this worker sits out a
+                # while before trying the same restaurant again
+                bucket.slow_down()
+                await asyncio.sleep(BLOCK_COOLDOWN)
+        duration = time.time() - start_time
+
+        # Still blocked: leave it out of the scraped set and the progress log
+        # so --resume tries it again
+        if result.get('blocked'):
+            progress.blocked += 1
+            progress.update(found=False, duration=duration)
+            progress.print_status()
+            continue
+
+        # Update progress. Nothing here awaits, so workers sharing the event
+        # loop can't interleave these updates and no lock is needed.
+        restaurant_id = restaurant_key(restaurant['name'], restaurant['address'])
+        progress_data['scraped_ids'].add(restaurant_id)
+        if result.get('found'):
+            progress_data['results'].append(result)
+        else:
+            progress_data['failed'].append(result)
+        progress.update(found=result.get('found', False), duration=duration)
+        progress.print_status()
 
-            # Rate limiting delay
-            delay = random.uniform(MIN_DELAY, MAX_DELAY)
-            await asyncio.sleep(delay)
+        # Append to the progress log off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, append_progress, result)
 
-        await browser.close()
 
-
-async def run_scraper(sample_size=None, resume=False, num_workers=DEFAULT_WORKERS, prioritize_unspecified=True):
+async def run_scraper(sample_size=None, resume=False, num_workers=DEFAULT_WORKERS, prioritize_unspecified=True,
+                      use_nominatim=False):
     """Main parallel scraper function."""
     print("=" * 70)
     print("Google Maps PARALLEL Restaurant Scraper")
@@ -407,29 +742,31 @@ async def run_scraper(sample_size=None, resume=False, num_workers=DEFAULT_WORKER
 
     # Load data
     print("\nLoading restaurant data...")
-    restaurants = load_restaurants()
+    # File I/O runs in the default executor so it never blocks the event loop
+    loop = asyncio.get_running_loop()
+    restaurants = await loop.run_in_executor(None, load_restaurants)
     print(f"Total restaurants: {len(restaurants)}")
 
     # Load progress if resuming
-    progress_data = load_progress() if resume else {
-        'scraped_ids': [],
-        'results': [],
-        'failed': [],
-        'last_updated': None
-    }
+    progress_data = await loop.run_in_executor(None, load_progress) if resume else new_progress()
 
     if resume and progress_data['scraped_ids']:
         print(f"Resuming: {len(progress_data['scraped_ids'])} already scraped")
 
-    # Filter out already scraped
-    scraped_set = set(progress_data['scraped_ids'])
-    remaining = [r for r in restaurants if f"{r['name']}|{r['address']}" not in scraped_set]
+    # Filter out already scraped and, if requested, put "Unspecified"
+    # categories first, in one pass over the restaurants
+    scraped_set = progress_data['scraped_ids']
+    unspecified, specified = [], []
+    for r in restaurants:
+        if scraped_set and restaurant_key(r['name'], r['address']) in scraped_set:
+            continue
+        if prioritize_unspecified and 'Unspecified' in r.get('category', ''):
+            unspecified.append(r)
+        else:
+            specified.append(r)
+    remaining = unspecified + specified
 
-    # Prioritize "Unspecified" categories
     if prioritize_unspecified:
-        unspecified = [r for r in remaining if 'Unspecified' in r.get('category', '')]
-        specified = [r for r in remaining if 'Unspecified' not in r.get('category', '')]
-        remaining = unspecified + specified
         print(f"Prioritizing {len(unspecified)} 'Unspecified' category restaurants")
 
     # Apply sample size
@@ -443,42 +780,53 @@ async def run_scraper(sample_size=None, resume=False, num_workers=DEFAULT_WORKER
         return
 
     # Estimate time
-    est_time = (len(remaining) / num_workers) * ((MIN_DELAY + MAX_DELAY) / 2 + 3)  # 3 sec per request + delay
+    # Whichever is slower: the workers loading pages, or the rate limit
+    est_time = len(remaining) / min(num_workers / SECONDS_PER_PAGE, REQUESTS_PER_SEC)
     print(f"Estimated time: {timedelta(seconds=int(est_time))}")
 
-    # Create queue
-    queue = asyncio.Queue()
-    for r in remaining:
-        await queue.put(r)
+    await loop.run_in_executor(None, start_progress_log, resume)
+
+    # Work shared by all workers
+    restaurants_iter = iter(remaining)
 
     # Create progress tracker
     progress = ProgressTracker(len(remaining))
-    progress_lock = asyncio.Lock()
-    results_lock = asyncio.Lock()
 
     print(f"\nStarting {num_workers} workers...\n")
 
-    # Start workers
-    workers = [
-        asyncio.create_task(worker(i, queue, progress, progress_lock, results_lock, progress_data))
-        for i in range(num_workers)
-    ]
+    # One browser shared by every worker, through a pool of contexts
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=True,
+            args=[
+                '--disable-blink-features=AutomationControlled',
+                '--no-sandbox',
+                '--disable-dev-shm-usage',
+                '--disable-gpu',
+                # Blink never requests images, so they don't even reach the route handler
+                '--blink-settings=imagesEnabled=false',
+            ]
+        )
+
+        pool = ContextPool(browser, num_workers)
+        await pool.start()
 
-    # Save progress periodically
-    async def save_periodically():
-        while not all(w.done() for w in workers):
-            await asyncio.sleep(30)  # Save every 30 seconds
-            save_progress(progress_data)
+        bucket = TokenBucket(REQUESTS_PER_SEC, BURST)
+        http_bucket = TokenBucket(NOMINATIM_REQUESTS_PER_SEC, 1) if use_nominatim else None
 
-    save_task = asyncio.create_task(save_periodically())
+        # Start workers
+        workers = [
+            asyncio.create_task(worker(i, pool, bucket, restaurants_iter, progress, progress_data, http_bucket))
+            for i in range(num_workers)
+        ]
 
-    # Wait for all workers
-    await asyncio.gather(*workers)
-    save_task.cancel()
+        # Wait for all workers
+        await asyncio.gather(*workers)
+        await pool.close()
+        await browser.close()
 
     # Final save
-    save_progress(progress_data)
-    save_results(progress_data['results'])
+    await loop.run_in_executor(None, save_results, progress_data['results'])
 
     # Summary
     print("\n\n" + "=" * 70)
@@ -486,11 +834,15 @@ async def run_scraper(sample_size=None, resume=False, num_workers=DEFAULT_WORKER
     print("=" * 70)
     elapsed = time.time() - progress.start_time
     print(f"Total time: {timedelta(seconds=int(elapsed))}")
-    print(f"Total scraped: {len(progress_data['scraped_ids'])}")
+    # Results and failures rather than the id set, so repeated restaurants count each time
+    total_scraped = len(progress_data['results']) + len(progress_data['failed'])
+    print(f"Total scraped: {total_scraped}")
     print(f"Found: {len(progress_data['results'])}")
     print(f"Not found: {len(progress_data['failed'])}")
-    print(f"Match rate: {len(progress_data['results']) / max(1, len(progress_data['scraped_ids'])) * 100:.1f}%")
-    print(f"Average rate: {len(progress_data['scraped_ids']) / max(1, elapsed) * 60:.1f} restaurants/min")
+    if progress.blocked:
+        print(f"Blocked by Google: {progress.blocked} (not saved; run with --resume to retry)")
+    print(f"Match rate: {len(progress_data['results']) / max(1, total_scraped) * 100:.1f}%")
+    print(f"Average rate: {total_scraped / max(1, elapsed) * 60:.1f} restaurants/min")
     print(f"\nResults saved to: {OUTPUT_FILE}")
     print(f"Progress saved to: {PROGRESS_FILE}")
 
@@ -502,6 +854,8 @@ def main():
     parser.add_argument('--resume', action='store_true', help='Resume from last progress')
     parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help=f'Number of parallel workers (default: {DEFAULT_WORKERS})')
     parser.add_argument('--no-prioritize', action='store_true', help='Do not prioritize Unspecified categories')
+    parser.add_argument('--nominatim', action='store_true',
+                        help='Try OpenStreetMap (1 request/sec) before Google Maps for each restaurant')
 
     args = parser.parse_args()
 
@@ -518,7 +872,8 @@ def main():
         sample_size=sample_size,
         resume=args.resume,
         num_workers=args.workers,
-        prioritize_unspecified=not args.no_prioritize
+        prioritize_unspecified=not args.no_prioritize,
+        use_nominatim=args.nominatim
     ))
 
 